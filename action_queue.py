@@ -0,0 +1,73 @@
+from collections import deque
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+DROP_NEWEST = "drop_newest"
+DROP_OLDEST = "drop_oldest"
+
+class ActionQueue(QObject):
+    """
+    Bounded handoff of resolved actions from the keyboard hook thread to the
+    GUI thread. push() only appends to a deque (atomic under the GIL) and
+    posts a single wakeup while none is outstanding, so the hook callback
+    never waits on the GUI. The GUI thread then drains everything queued
+    since in one batch.
+
+    When the queue is full, DROP_NEWEST refuses the new action and
+    DROP_OLDEST discards the oldest queued one; either way `dropped` counts it.
+    """
+    wakeup = pyqtSignal()
+    overflowed = pyqtSignal(int)
+
+    def __init__(self, handler, maxlen=1024, policy=DROP_NEWEST, parent=None):
+        super().__init__(parent)
+        if policy not in (DROP_NEWEST, DROP_OLDEST):
+            raise ValueError(f"unknown overflow policy {policy!r}")
+        self.handler = handler
+        self.maxlen = maxlen
+        self.policy = policy
+        self.dropped = 0
+        self.pushed = 0
+        self.batches = 0
+        self.max_batch = 0
+        self._items = deque(maxlen=maxlen if policy == DROP_OLDEST else None)
+        self._wakeup_pending = False
+        self._reported_dropped = 0
+        self.wakeup.connect(self.drain)
+
+    def push(self, action):
+        """Called on the hook thread. Returns False if the action was dropped."""
+        items = self._items
+        if len(items) >= self.maxlen:
+            self.dropped += 1
+            if self.policy == DROP_NEWEST:
+                return False
+        items.append(action)
+        self.pushed += 1
+        if not self._wakeup_pending:
+            self._wakeup_pending = True
+            self.wakeup.emit()
+        return True
+
+    def drain(self):
+        """Runs on the GUI thread: hands every queued action to the handler, oldest first."""
+        # Clear the flag before draining so an action pushed mid-drain either
+        # gets drained here or posts a fresh wakeup.
+        self._wakeup_pending = False
+        items = self._items
+        handler = self.handler
+        count = 0
+        while items:
+            handler(items.popleft())
+            count += 1
+        if count:
+            self.batches += 1
+            if count > self.max_batch:
+                self.max_batch = count
+        if self.dropped != self._reported_dropped:
+            self._reported_dropped = self.dropped
+            self.overflowed.emit(self.dropped)
+
+    def summary_line(self):
+        return (f"Queue: {self.pushed} actions in {self.batches} batches "
+                f"(max {self.max_batch}), {self.dropped} dropped")
@@ -1,12 +1,21 @@
 import sys
 import os
+import copy
+import time
 import keyboard
-from PyQt5.QtWidgets import QApplication, QSystemTrayIcon, QMenu, QAction
+from PyQt5.QtWidgets import QApplication, QSystemTrayIcon, QMenu, QAction, QActionGroup
 from PyQt5.QtGui import QIcon
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
 
-from config import load_config, save_config
+from config import read_profiles, parse_profiles, ConfigWriter, CONFIG_DIR, CONFIG_FILE
 from overlay import Overlay
-from config_window import ConfigWindow
+from action_queue import ActionQueue
+from config_watcher import ConfigWatcher
+from focus_gate import FocusGate, create_provider
+from engine import SequenceEngine
+from hotkeys import HotkeyDispatcher
+from journal import SequenceJournal
+from runtime_config import compile_profile, profile_changes
 
 def resource_path(relative_path):
     """ Get absolute path to resource, works for dev and for PyInstaller """
@@ -16,16 +25,54 @@ def resource_path(relative_path):
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
+class TrayNotifier(QObject):
+    """Lets background threads show tray messages; the signal is delivered on the GUI thread."""
+    message = pyqtSignal(str, str)
+
 class Application:
     """Main application class to manage everything."""
-    def __init__(self):
+    def __init__(self, latency=False, profiler=None, replay=None, replay_speed=1.0, diagnostics=False):
+        self.profiler = profiler
+        self.replay_path = replay
+        self.replay_speed = replay_speed
+        self.recorder = None
+        self.replayer = None
+        self.replay_hotkeys = None
+        self.tray = None
+        self.diagnostics = None
+        self.path_profiler = None
+        self._hook = None
         self.app = QApplication(sys.argv)
         self.app.setQuitOnLastWindowClosed(False)
+        self._mark("QApplication created")
         
-        self.config = load_config()
-        self.pressed_hotkeys = set()
-        self.action_map = {}
+        self.profiles, self.load_problem = read_profiles()
+        self.profile_name = self.profiles["active_profile"]
+        self.config = self.profiles["profiles"][self.profile_name]
+        self.compiled = {}
+        self.journal = SequenceJournal(os.path.join(CONFIG_DIR, "journal"))
+        self.engine = SequenceEngine(self.compile_profile(self.profile_name), profile_name=self.profile_name,
+                                     journal=self.journal)
+        self.hotkeys = self.engine.dispatcher
+        self._capturing = False
+        self.focus_gate = FocusGate(create_provider(), on_change=lambda allowed: self.update_dispatch_paused())
+        self.apply_focus_targets(self.compiled[self.profile_name])
+        self.focus_gate.start()
         self.config_win = None
+        self.latency = None
+        if latency:
+            from latency import LatencyTracker
+            self.latency = LatencyTracker()
+        self._mark("config loaded")
+
+        # Arm hotkeys first; the tray icon and config writer are not needed to react to keys.
+        self.overlay = Overlay(self.engine)
+        self.overlay.latency = self.latency
+        self.overlay.next_profile_requested.connect(self.next_profile)
+        self.actions = ActionQueue(self.overlay.handle_key_event)
+        self._mark("overlay created")
+        self.install_hook(self.key_handler())
+        self._mark("hotkeys armed")
 
         try:
             icon_path = resource_path("icon.png")
@@ -33,31 +80,166 @@ class Application:
         except:
             style = self.app.style()
             self.app_icon = style.standardIcon(style.SP_ComputerIcon)
-
-        self.overlay = Overlay(self.config)
         self.setup_tray_icon()
-        self.register_hotkeys()
+        if self.load_problem:
+            self.tray.showMessage("Config", self.load_problem, QSystemTrayIcon.Warning)
+        self.config_writer = ConfigWriter()
+        self.config_watcher = ConfigWatcher(CONFIG_FILE, parent=self.app)
+        self.config_watcher.changed.connect(self.reload_config)
+        self.config_watcher.start()
+        self._mark("tray icon ready")
+        if diagnostics:
+            self.toggle_diagnostics()
+        QTimer.singleShot(0, self.warm_profiles)
 
-    def register_hotkeys(self):
-        keyboard.unhook_all()
-        self.action_map = {hotkey: action for action, hotkey in self.config.get("hotkeys", {}).items()}
-        keyboard.hook(self.keyboard_event_handler)
+    def _mark(self, name):
+        if self.profiler is not None:
+            self.profiler.mark(name)
+
+    def compile_profile(self, name):
+        """Validates and compiles a profile's config; problems are reported once the tray icon exists."""
+        profile = compile_profile(self.profiles["profiles"][name])
+        self.compiled[name] = profile
+        if profile.errors and self.tray is not None:
+            self.report_config_errors(name, profile.errors)
+        return profile
+
+    def report_config_errors(self, name, errors):
+        shown = "\n".join(errors[:5])
+        if len(errors) > 5:
+            shown += f"\n...and {len(errors) - 5} more"
+        self.tray.showMessage(f"Problems in profile {name}", shown, QSystemTrayIcon.Warning)
+
+    def apply_hotkeys(self):
+        """Swaps in a freshly compiled hotkey table; the keyboard hook itself stays installed."""
+        self.hotkeys.set_table(self.compile_profile(self.profile_name).hotkeys)
+
+    def warm_profiles(self):
+        """Compiles every profile, restores its sequence and styles its overlay strip ahead of the first switch."""
+        self.engine.restore_profiles(self.profiles["profiles"])
+        for name in self.profiles["profiles"]:
+            profile = self.compiled.get(name)
+            if profile is None:
+                profile = self.compile_profile(name)
+            elif profile.errors:
+                self.report_config_errors(name, profile.errors)
+            self.overlay.prepare_style(profile)
+
+    def switch_profile(self, name, save=True):
+        """Makes another profile active by swapping in its prepared hotkey table and overlay state."""
+        if name == self.profile_name or name not in self.profiles["profiles"]:
+            return
+        self.profile_name = name
+        self.profiles["active_profile"] = name
+        self.config = self.profiles["profiles"][name]
+        profile = self.compiled.get(name) or self.compile_profile(name)
+        self.engine.switch_profile(name, profile)
+        self.overlay.sync_profile()
+        self.apply_focus_targets(profile)
+        self.update_profile_menu()
+        if save:
+            self.config_writer.save(self.profiles)
+
+    def next_profile(self):
+        names = list(self.profiles["profiles"])
+        self.switch_profile(names[(names.index(self.profile_name) + 1) % len(names)])
+
+    def create_profile(self):
+        """Adds a profile copied from the active one and switches to it."""
+        from PyQt5.QtWidgets import QInputDialog
+        name, ok = QInputDialog.getText(None, "New Profile", "Profile name:")
+        name = name.strip()
+        if not ok or not name:
+            return
+        if name in self.profiles["profiles"]:
+            self.tray.showMessage("Profiles", f"A profile named {name} already exists.", QSystemTrayIcon.Warning)
+            return
+        self.profiles["profiles"][name] = copy.deepcopy(self.config)
+        self.compiled[name] = self.compiled[self.profile_name]
+        self.engine.restore_profiles([name])
+        self.switch_profile(name)
+
+    def delete_profile(self):
+        """Removes the active profile and switches to the next one."""
+        if len(self.profiles["profiles"]) < 2:
+            return
+        name = self.profile_name
+        self.next_profile()
+        del self.profiles["profiles"][name]
+        self.compiled.pop(name, None)
+        self.engine.forget_profile(name)
+        self.update_profile_menu()
+        self.config_writer.save(self.profiles)
+
+    def key_handler(self):
+        return self.keyboard_event_handler if self.latency is None else self.instrumented_keyboard_event_handler
+
+    def install_hook(self, handler):
+        """Hooks handler in place of the current keyboard hook callback."""
+        if self._hook is not None:
+            keyboard.unhook(self._hook)
+        self._hook = keyboard.hook(handler)
+
+    def set_hotkey_capture(self, capturing):
+        """
+        Pauses dispatch while the config dialog is capturing a hotkey. A focus
+        event delivered after the dialog closed must not leave hotkeys paused.
+        """
+        self._capturing = capturing and self.config_win is not None and self.config_win.isVisible()
+        self.update_dispatch_paused()
+
+    def apply_focus_targets(self, profile):
+        self.focus_gate.set_targets(profile.focus_processes, profile.focus_titles)
+
+    def update_dispatch_paused(self):
+        """Hotkeys fire only when no capture is running and the focus gate is open."""
+        self.hotkeys.paused = self._capturing or not self.focus_gate.allowed
 
     def keyboard_event_handler(self, event: keyboard.KeyboardEvent):
-        if event.event_type == keyboard.KEY_DOWN:
-            for hotkey_str, action in self.action_map.items():
-                try:
-                    if keyboard.is_pressed(hotkey_str) and hotkey_str not in self.pressed_hotkeys:
-                        self.pressed_hotkeys.add(hotkey_str)
-                        self.overlay.key_action_triggered.emit(action)
-                except Exception:
-                    pass
-        
-        elif event.event_type == keyboard.KEY_UP:
-            pressed_hotkeys_copy = self.pressed_hotkeys.copy()
-            for hotkey_str in pressed_hotkeys_copy:
-                if not keyboard.is_pressed(hotkey_str):
-                    self.pressed_hotkeys.remove(hotkey_str)
+        is_down = event.event_type == keyboard.KEY_DOWN
+        action = self.hotkeys.feed(event.scan_code, is_down)
+        if action is not None:
+            self.actions.push(action)
+        if self.recorder is not None:
+            self.recorder.record(event.scan_code, is_down, action)
+        return action
+
+    def instrumented_keyboard_event_handler(self, event: keyboard.KeyboardEvent):
+        """keyboard_event_handler with latency stamps; only hooked when latency tracking is enabled."""
+        hook_ns = time.perf_counter_ns()
+        is_down = event.event_type == keyboard.KEY_DOWN
+        action = self.hotkeys.feed(event.scan_code, is_down)
+        if action is not None:
+            self.push_stamped_action(action, hook_ns)
+        if self.recorder is not None:
+            self.recorder.record(event.scan_code, is_down, action)
+        return action
+
+    def push_stamped_action(self, action, hook_ns):
+        self.latency.hook_event(hook_ns)
+        dropped = self.actions.dropped
+        pushed = self.actions.push(action)
+        if self.actions.dropped != dropped:
+            self.latency.action_dropped(newest=not pushed)
+
+    def replay_event_handler(self, event):
+        """
+        keyboard_event_handler for the Replayer's thread. It resolves keys
+        with a dispatcher of its own, following the live table and pause
+        state, so replayed held keys and chords don't mix with the hook's.
+        """
+        hook_ns = time.perf_counter_ns()
+        dispatcher = self.replay_hotkeys
+        if dispatcher.table is not self.hotkeys.table:
+            dispatcher.set_table(self.hotkeys.table)
+        dispatcher.paused = self.hotkeys.paused
+        action = dispatcher.feed(event.scan_code, event.event_type == keyboard.KEY_DOWN)
+        if action is not None:
+            if self.latency is None:
+                self.actions.push(action)
+            else:
+                self.push_stamped_action(action, hook_ns)
+        return action
 
     def setup_tray_icon(self):
         self.tray = QSystemTrayIcon(self.app_icon, self.app)
@@ -65,23 +247,176 @@ class Application:
         self.tray.setVisible(True)
 
         self.tray.activated.connect(self.on_tray_icon_activated)
+        self.notifier = TrayNotifier()
+        self.notifier.message.connect(self.tray.showMessage)
+        self.actions.overflowed.connect(self.on_actions_dropped)
 
         menu = QMenu()
-        toggle_action = QAction("Disable Overlay", self.app)
-        toggle_action.triggered.connect(lambda: self.toggle_overlay(toggle_action))
-        menu.addAction(toggle_action)
+        self.toggle_action = QAction("Disable Overlay", self.app)
+        self.toggle_action.triggered.connect(self.toggle_overlay)
+        menu.addAction(self.toggle_action)
+        menu.aboutToShow.connect(self.update_toggle_action)
 
         config_action = QAction("Configure", self.app)
         config_action.triggered.connect(self.show_config_window)
         menu.addAction(config_action)
+
+        self.profile_menu = menu.addMenu("Profiles")
+        self.profile_group = QActionGroup(self.profile_menu)
+        self.update_profile_menu()
+
+        self.record_action = QAction("Start Recording", self.app)
+        self.record_action.triggered.connect(self.toggle_recording)
+        menu.addAction(self.record_action)
+
+        diagnostics_menu = menu.addMenu("Diagnostics")
+        self.diagnostics_action = diagnostics_menu.addAction("Start Diagnostics", self.toggle_diagnostics)
+        self.snapshot_action = diagnostics_menu.addAction("Take Snapshot", self.take_diagnostics_snapshot)
+        self.snapshot_action.setEnabled(False)
+        self.profiling_action = diagnostics_menu.addAction("Start Profiling", self.toggle_profiling)
+
+        if self.latency is not None:
+            menu.addSeparator()
+            self.latency_action = QAction(self.latency.summary_line(), self.app)
+            self.latency_action.setEnabled(False)
+            menu.addAction(self.latency_action)
+            dump_action = QAction("Dump Latency Stats", self.app)
+            dump_action.triggered.connect(self.dump_latency)
+            menu.addAction(dump_action)
+
+            self.latency_timer = QTimer(self.app)
+            self.latency_timer.timeout.connect(self.update_latency_summary)
+            self.latency_timer.start(2000)
         
         menu.addSeparator()
         quit_action = QAction("Quit", self.app)
         quit_action.triggered.connect(self.quit)
         menu.addAction(quit_action)
 
+        self.tray_menu = menu
         self.tray.setContextMenu(menu)
 
+    def update_profile_menu(self):
+        menu = self.profile_menu
+        menu.clear()
+        for name in self.profiles["profiles"]:
+            action = QAction(name, menu)
+            action.setCheckable(True)
+            action.setChecked(name == self.profile_name)
+            action.triggered.connect(lambda checked, name=name: self.switch_profile(name))
+            self.profile_group.addAction(action)
+            menu.addAction(action)
+        menu.addSeparator()
+        menu.addAction("New Profile...", self.create_profile)
+        delete_action = menu.addAction("Delete Current Profile", self.delete_profile)
+        delete_action.setEnabled(len(self.profiles["profiles"]) > 1)
+
+    def toggle_recording(self):
+        """Starts or stops capturing every hook event to a session recording."""
+        from recorder import RecordingWriter
+        if self.recorder is None:
+            recordings_dir = os.path.join(CONFIG_DIR, "recordings")
+            path = os.path.join(recordings_dir, time.strftime("session-%Y%m%d-%H%M%S.mvnrec"))
+            try:
+                os.makedirs(recordings_dir, exist_ok=True)
+                self.recorder = RecordingWriter(path, self.config.get("hotkeys", {}).keys())
+            except OSError as e:
+                self.tray.showMessage("Recording", f"Could not start recording: {e}", QSystemTrayIcon.Warning)
+                return
+            self.record_action.setText("Stop Recording")
+        else:
+            recorder, self.recorder = self.recorder, None
+            recorder.close()
+            self.record_action.setText("Start Recording")
+            if recorder.error is not None:
+                self.tray.showMessage("Recording", f"Could not write {recorder.path}: {recorder.error}",
+                                      QSystemTrayIcon.Warning)
+            else:
+                self.tray.showMessage("Recording", f"Saved {recorder.count} events to {recorder.path}")
+
+    def toggle_diagnostics(self):
+        """Starts or stops periodic memory and object-count sampling to CONFIG_DIR/diagnostics."""
+        from diagnostics import Diagnostics
+        if self.diagnostics is None:
+            self.diagnostics = Diagnostics(os.path.join(CONFIG_DIR, "diagnostics"), parent=self.app)
+            self.diagnostics.sources["overlay"] = self.overlay.stats
+            try:
+                self.diagnostics.start()
+            except OSError as e:
+                self.diagnostics.stop()
+                self.diagnostics = None
+                self.tray.showMessage("Diagnostics", f"Could not start diagnostics: {e}", QSystemTrayIcon.Warning)
+                return
+            self.diagnostics_action.setText("Stop Diagnostics")
+            self.snapshot_action.setEnabled(True)
+            self.tray.showMessage("Diagnostics", f"Sampling to {self.diagnostics.log_path}")
+        else:
+            diagnostics, self.diagnostics = self.diagnostics, None
+            diagnostics.stop()
+            diagnostics.deleteLater()
+            self.diagnostics_action.setText("Start Diagnostics")
+            self.snapshot_action.setEnabled(False)
+            self.tray.showMessage("Diagnostics", f"Took {diagnostics.samples} samples")
+
+    def take_diagnostics_snapshot(self):
+        if self.diagnostics is not None:
+            self.diagnostics.sample()
+
+    def toggle_profiling(self):
+        """Starts or stops cProfile on the GUI thread and timing of the keyboard hook handler."""
+        from diagnostics import PathProfiler
+        if self.path_profiler is None:
+            profiler = PathProfiler()
+            try:
+                profiler.start()
+            except ValueError as e:
+                self.tray.showMessage("Profiling", f"Could not start profiling: {e}", QSystemTrayIcon.Warning)
+                return
+            self.path_profiler = profiler
+            self.install_hook(profiler.wrap(self.key_handler()))
+            self.profiling_action.setText("Stop Profiling")
+        else:
+            profiler, self.path_profiler = self.path_profiler, None
+            self.install_hook(self.key_handler())
+            self.profiling_action.setText("Start Profiling")
+            directory = os.path.join(CONFIG_DIR, "diagnostics")
+            try:
+                os.makedirs(directory, exist_ok=True)
+                paths = profiler.stop(directory)
+            except OSError as e:
+                self.tray.showMessage("Profiling", f"Could not write profiles: {e}", QSystemTrayIcon.Warning)
+                return
+            self.tray.showMessage("Profiling", "Saved " + " and ".join(paths))
+
+    def start_replay(self, path, speed=1.0):
+        """Replays a session recording through the hotkey handler; speed 0 replays as fast as possible."""
+        from recorder import Replayer
+        if self.replayer is not None:
+            self.replayer.stop()
+        self.replay_hotkeys = HotkeyDispatcher(self.hotkeys.table)
+        self.replayer = Replayer(path, self.replay_event_handler, speed,
+                                 on_finished=lambda replayer: self.notifier.message.emit("Replay", replayer.summary()))
+        self.replayer.start()
+
+    def on_actions_dropped(self, dropped):
+        self.tray.showMessage("Hotkeys", f"The overlay fell behind; {dropped} hotkey presses were dropped so far.",
+                              QSystemTrayIcon.Warning)
+
+    def update_latency_summary(self):
+        summary = self.latency.summary_line()
+        self.latency_action.setText(summary)
+        self.tray.setToolTip(f"PoE Maven Memory Game Helper\n{summary}\n{self.actions.summary_line()}")
+
+    def dump_latency(self):
+        path = os.path.join(CONFIG_DIR, time.strftime("latency-%Y%m%d-%H%M%S.json"))
+        try:
+            os.makedirs(CONFIG_DIR, exist_ok=True)
+            self.latency.dump(path)
+        except OSError as e:
+            self.tray.showMessage("Latency Stats", f"Could not write stats: {e}", QSystemTrayIcon.Warning)
+            return
+        self.tray.showMessage("Latency Stats", f"Saved to {path}")
+
     def on_tray_icon_activated(self, reason):
         """
         Handles activation events on the system tray icon.
@@ -89,33 +424,146 @@ class Application:
         if reason == QSystemTrayIcon.DoubleClick:
             self.show_config_window()
 
-    def toggle_overlay(self, action):
-        self.overlay.overlay_enabled = not self.overlay.overlay_enabled
-        action.setText("Enable Overlay" if not self.overlay.overlay_enabled else "Disable Overlay")
-        self.overlay.update_display()
+    def toggle_overlay(self):
+        self.engine.toggle_enabled()
+        self.update_toggle_action()
+
+    def update_toggle_action(self):
+        """The Toggle Overlay hotkey flips the same engine flag, so the label is read from it on demand."""
+        self.toggle_action.setText("Disable Overlay" if self.engine.enabled else "Enable Overlay")
 
     def show_config_window(self):
         """
         Shows the configuration window. If it's already open, it brings it to the front.
         """
         if self.config_win is None or not self.config_win.isVisible():
-            keyboard.unhook_all()
-            self.config_win = ConfigWindow(self.config, self.app_icon)
-            self.config_win.config_saved.connect(self.on_config_saved)
-            self.config_win.finished.connect(self.register_hotkeys)
+            from config_window import ConfigWindow
+            self.config_win = ConfigWindow(self.config, self.app_icon, profile_name=self.profile_name)
+            self.config_win.config_saved.connect(
+                lambda new_config, name=self.profile_name: self.on_config_saved(new_config, name))
+            self.config_win.capture_changed.connect(self.set_hotkey_capture)
+            self.config_win.preview_changed.connect(self.on_preview_changed)
+            self.config_win.finished.connect(lambda: self.set_hotkey_capture(False))
+            self.config_win.finished.connect(self.end_preview)
+            self.config_win.finished.connect(self.on_config_window_finished)
             self.config_win.show()
         else:
             self.config_win.activateWindow()
             self.config_win.raise_()
 
-    def on_config_saved(self, new_config):
-        self.config = new_config
-        save_config(self.config)
-        self.overlay.update_config(self.config)
+    def on_config_window_finished(self):
+        """Deletes the closed dialog so its widgets and connections don't pile up across opens."""
+        if self.config_win is not None:
+            self.config_win.deleteLater()
+            self.config_win = None
+
+    def on_preview_changed(self, preview_config):
+        if preview_config is None:
+            self.end_preview()
+        else:
+            self.engine.show_preview(compile_profile(preview_config))
+            self.overlay.sync_profile()
+
+    def end_preview(self):
+        if self.engine.previewing:
+            self.engine.end_preview()
+            self.overlay.sync_profile()
+
+    def on_config_saved(self, new_config, profile_name=None):
+        """Stores an edited profile; the dialog may have been opened before a profile switch."""
+        name = self.profile_name if profile_name is None else profile_name
+        if name not in self.profiles["profiles"]:
+            return
+        self.end_preview()
+        self.update_profile(name, new_config)
+        self.config_writer.save(self.profiles)
+
+    def update_profile(self, name, config):
+        """
+        Stores and recompiles one profile. For the active profile only what
+        changed is reapplied: the hotkey table, the sequence actions, the
+        strip style or the position.
+        """
+        old = self.compiled.get(name)
+        self.profiles["profiles"][name] = config
+        profile = self.compile_profile(name)
+        if name != self.profile_name:
+            if old is None:
+                self.engine.restore_profiles([name])
+            if old is None or old.style_key != profile.style_key:
+                self.overlay.prepare_style(profile)
+            return
+        self.config = config
+        changes = profile_changes(old, profile)
+        self.engine.update_profile(profile, changes)
+        self.overlay.update_profile(profile, changes)
+        if "focus" in changes:
+            self.apply_focus_targets(profile)
+
+    def reload_config(self):
+        """Applies edits made to config.json outside the app. The app's own writes are skipped."""
+        try:
+            with open(CONFIG_FILE, 'r') as f:
+                text = f.read()
+        except OSError:
+            return
+        if text == self.config_writer.last_written:
+            return
+        try:
+            profiles = parse_profiles(text)
+        except ValueError as e:
+            self.tray.showMessage("Config", f"config.json was not reloaded: {e}", QSystemTrayIcon.Warning)
+            return
+
+        current = self.profiles["profiles"]
+        for name, config in profiles["profiles"].items():
+            if current.get(name) != config:
+                self.update_profile(name, config)
+        removed = set(current) - set(profiles["profiles"])
+        for name in removed:
+            self.compiled.pop(name, None)
+        self.profiles["profiles"] = {name: current[name] for name in profiles["profiles"]}
+        self.switch_profile(profiles["active_profile"], save=False)
+        for name in removed:
+            self.engine.forget_profile(name)
+        self.update_profile_menu()
+
+    def report_startup_profile(self):
+        """Writes the --startup-profile breakdown once the event loop is running."""
+        self._mark("event loop running")
+        self.profiler.uninstall()
+        report = self.profiler.report()
+        path = os.path.join(CONFIG_DIR, "startup-profile.txt")
+        try:
+            os.makedirs(CONFIG_DIR, exist_ok=True)
+            with open(path, 'w') as f:
+                f.write(report + "\n")
+        except OSError:
+            path = None
+        if sys.stdout is not None:
+            print(report)
+        if path:
+            self.tray.showMessage("Startup Profile", f"Saved to {path}")
 
     def run(self):
+        if self.profiler is not None:
+            QTimer.singleShot(0, self.report_startup_profile)
+        if self.replay_path:
+            QTimer.singleShot(0, lambda: self.start_replay(self.replay_path, self.replay_speed))
         sys.exit(self.app.exec_())
 
     def quit(self):
         keyboard.unhook_all()
+        self.focus_gate.stop()
+        if self.path_profiler is not None:
+            self.path_profiler.gui.disable()
+        if self.diagnostics is not None:
+            self.diagnostics.stop()
+        if self.replayer is not None:
+            self.replayer.stop()
+        if self.recorder is not None:
+            self.recorder.close()
+        self.config_watcher.stop()
+        self.config_writer.close()
+        self.journal.close()
         self.app.quit()
@@ -0,0 +1,307 @@
+"""
+Headless benchmarks for the hotkey dispatch, overlay and config paths.
+
+    python benchmarks/run.py --output results.json
+    python benchmarks/run.py --output new.json --compare results.json
+
+Runs on Qt's offscreen platform with the stub keyboard and win32 modules in
+benchmarks/stubs, so it works on Linux and in CI. Every figure is written to
+a flat "metrics" map in the JSON output so two runs can be compared key by key.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+
+SEQUENCE_KEYS = ['f1', 'f2', 'f3']
+FILLER_KEYS = list('qwertyuiopasdfghjklzxcvbnm') + [str(i) for i in range(10)] + ['space', 'tab', 'enter']
+EXTRA_TRIGGERS = [f'f{i}' for i in range(6, 25)] + list('qwertyuiopasdfghjklzxcvbnm') + [str(i) for i in range(10)]
+PARITY_SEQUENCE = [0, 1, 2, 0]
+MAX_DIFFERING_PIXELS = 100
+EXTRA_MODIFIERS = ['', 'ctrl+', 'shift+', 'alt+', 'ctrl+shift+', 'ctrl+alt+', 'alt+shift+', 'ctrl+alt+shift+']
+
+def prepare_environment():
+    """Points Qt, APPDATA and the import path at headless stand-ins. Must run before importing the app."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    os.environ["APPDATA"] = tempfile.mkdtemp(prefix="maven-bench-")
+    sys.path[:0] = [os.path.join(BENCH_DIR, "stubs"), REPO_DIR]
+
+def summarize(samples_ns):
+    samples = sorted(samples_ns)
+    count = len(samples)
+    return {
+        "p50_us": round(samples[count // 2] / 1000, 3),
+        "p99_us": round(samples[min(count - 1, int(count * 0.99))] / 1000, 3),
+        "mean_us": round(sum(samples) / count / 1000, 3),
+    }
+
+def make_hotkeys(count):
+    """The default bindings plus enough generated ones to reach `count`."""
+    from config import DEFAULT_CONFIG
+    hotkeys = dict(DEFAULT_CONFIG["hotkeys"])
+    combos = (modifier + key for modifier in EXTRA_MODIFIERS for key in EXTRA_TRIGGERS)
+    for i, combo in zip(range(count - len(hotkeys)), combos):
+        hotkeys[f"Bench {i}"] = combo
+    return hotkeys
+
+def make_events(length, seed=0):
+    """
+    A synthetic typing stream: mostly unbound keys, some sequence hotkeys,
+    an occasional clear, and auto-repeated KEY_DOWNs on held keys.
+    """
+    import keyboard
+    rng = random.Random(seed)
+    events = []
+    while len(events) < length:
+        roll = rng.random()
+        if roll < 0.08:
+            name = rng.choice(SEQUENCE_KEYS)
+        elif roll < 0.09:
+            name = 'f4'
+        else:
+            name = rng.choice(FILLER_KEYS)
+        scan_code = keyboard.key_to_scan_codes(name)[0]
+        events.append(keyboard.KeyboardEvent(keyboard.KEY_DOWN, scan_code, name))
+        if rng.random() < 0.1:
+            events.append(keyboard.KeyboardEvent(keyboard.KEY_DOWN, scan_code, name))
+        events.append(keyboard.KeyboardEvent(keyboard.KEY_UP, scan_code, name))
+    return events[:length]
+
+def bench_dispatch(application, event_counts, hotkey_counts, metrics):
+    """Per-event cost of Application.keyboard_event_handler, including the overlay state update."""
+    handler = application.keyboard_event_handler
+    clock = time.perf_counter_ns
+    for hotkey_count in hotkey_counts:
+        application.config["hotkeys"] = make_hotkeys(hotkey_count)
+        application.apply_hotkeys()
+        for event_count in event_counts:
+            events = make_events(event_count, seed=hotkey_count)
+            application.overlay.handle_key_event('Clear Sequence')
+            samples = []
+            for event in events:
+                start = clock()
+                handler(event)
+                samples.append(clock() - start)
+            for name, value in summarize(samples).items():
+                metrics[f"dispatch.hotkeys_{hotkey_count}.events_{event_count}.{name}"] = value
+
+def bench_overlay_events(overlay, event_counts, metrics):
+    """Per-call cost of Overlay.handle_key_event on its own."""
+    clock = time.perf_counter_ns
+    for event_count in event_counts:
+        rng = random.Random(event_count)
+        actions = [rng.choice(['Sequence 1', 'Sequence 2', 'Sequence 3']) for _ in range(event_count)]
+        overlay.handle_key_event('Clear Sequence')
+        overlay.flush_display()
+        before = overlay.stats()
+        samples = []
+        for action in actions:
+            start = clock()
+            overlay.handle_key_event(action)
+            samples.append(clock() - start)
+        overlay.flush_display()
+        after = overlay.stats()
+        overlay.handle_key_event('Clear Sequence')
+        overlay.flush_display()
+        for name, value in summarize(samples).items():
+            metrics[f"overlay_event.events_{event_count}.{name}"] = value
+        metrics[f"overlay_event.events_{event_count}.merged_updates"] = after["merged_updates"] - before["merged_updates"]
+
+def bench_engine(config, event_counts, metrics):
+    """Per-event cost of SequenceEngine.feed on its own: resolution plus sequence update, no Qt."""
+    from engine import SequenceEngine
+    from runtime_config import compile_profile
+    import keyboard
+
+    engine = SequenceEngine(compile_profile(config))
+    down = keyboard.KEY_DOWN
+    clock = time.perf_counter_ns
+    for event_count in event_counts:
+        events = [(event.scan_code, event.event_type == down) for event in make_events(event_count, seed=event_count)]
+        engine.apply('Clear Sequence')
+        start = clock()
+        for scan_code, is_down in events:
+            engine.feed(scan_code, is_down)
+        elapsed = clock() - start
+        metrics[f"engine.events_{event_count}.mean_us"] = round(elapsed / event_count / 1000, 3)
+
+def bench_render(config, sequence_lengths, metrics, repeats=5):
+    """Full rebuild and single-push flush cost against sequence length, per renderer."""
+    import copy
+    from engine import SequenceEngine
+    from overlay import Overlay
+    from renderers import RENDERERS
+    from runtime_config import compile_profile
+
+    clock = time.perf_counter_ns
+    for renderer in RENDERERS:
+        renderer_config = copy.deepcopy(config)
+        renderer_config["style"]["renderer"] = renderer
+        overlay = Overlay(SequenceEngine(compile_profile(renderer_config)))
+        sequence = overlay.engine.sequence
+        for length in sequence_lengths:
+            codes = [i % 3 for i in range(length)]
+            rebuild = []
+            push = []
+            for _ in range(repeats):
+                sequence.clear()
+                for code in codes:
+                    sequence.push(code)
+                start = clock()
+                overlay.update_display()
+                rebuild.append(clock() - start)
+
+                overlay.handle_key_event('Sequence 1')
+                start = clock()
+                overlay.flush_display()
+                push.append(clock() - start)
+            metrics[f"render.{renderer}.length_{length}.rebuild_p50_us"] = summarize(rebuild)["p50_us"]
+            metrics[f"render.{renderer}.length_{length}.push_p50_us"] = summarize(push)["p50_us"]
+        for low, high, mean_us in overlay.render_stats.summary():
+            metrics[f"render.{renderer}.stats.length_{low}_{high}.mean_us"] = mean_us
+        overlay.hide()
+        overlay.deleteLater()
+
+def check_render_parity(config, metrics):
+    """
+    Counts pixels where each renderer's strip differs from the labels renderer
+    for the same sequence, with and without the "+k more" indicator. -1 means
+    the strips aren't even the same size. Going over MAX_DIFFERING_PIXELS is
+    reported on stderr.
+    """
+    from renderers import RENDERERS, create_styled_strip, count_differing_pixels
+    from runtime_config import compile_profile
+
+    key = compile_profile(config).style_key
+    reference = create_styled_strip(("labels",) + key[1:])
+    for renderer in RENDERERS:
+        if renderer == "labels":
+            continue
+        strip = create_styled_strip((renderer,) + key[1:])
+        for name, hidden in (("differing_pixels", 0), ("differing_pixels_with_hidden", 3)):
+            reference.set_sequence(PARITY_SEQUENCE, hidden)
+            strip.set_sequence(PARITY_SEQUENCE, hidden)
+            differing = count_differing_pixels(reference, strip)
+            if differing is None:
+                differing = -1
+            metrics[f"parity.{renderer}.{name}"] = differing
+            if not 0 <= differing <= MAX_DIFFERING_PIXELS:
+                print(f"warning: {renderer} renderer differs from labels ({name} = {differing})", file=sys.stderr)
+        strip.deleteLater()
+    reference.deleteLater()
+
+def bench_config(metrics, repeats=50):
+    import config
+    current = config.load_profiles()
+    samples = []
+    for i in range(repeats):
+        current["profiles"][current["active_profile"]]["style"]["y"] = i
+        start = time.perf_counter_ns()
+        config.save_config(current)
+        samples.append(time.perf_counter_ns() - start)
+    for name, value in summarize(samples).items():
+        metrics[f"config.save.{name}"] = value
+
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        config.load_profiles()
+        samples.append(time.perf_counter_ns() - start)
+    for name, value in summarize(samples).items():
+        metrics[f"config.load.{name}"] = value
+
+def startup_child():
+    """Runs in a fresh interpreter: times importing app.py and constructing Application."""
+    start = time.perf_counter_ns()
+    prepare_environment()
+    import app
+    imported = time.perf_counter_ns()
+    application = app.Application()
+    constructed = time.perf_counter_ns()
+    application.quit()
+    print(json.dumps({
+        "import_ms": (imported - start) / 1e6,
+        "init_ms": (constructed - imported) / 1e6,
+        "total_ms": (constructed - start) / 1e6,
+    }))
+
+def bench_startup(metrics, repeats=3):
+    runs = []
+    for _ in range(repeats):
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--startup-child"],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    for key in runs[0]:
+        metrics[f"startup.{key}"] = round(sorted(run[key] for run in runs)[len(runs) // 2], 3)
+
+def compare(baseline_path, metrics):
+    with open(baseline_path, 'r') as f:
+        baseline = json.load(f).get("metrics", {})
+    print(f"{'metric':<60} {'baseline':>12} {'current':>12} {'ratio':>8}")
+    for name in sorted(set(baseline) & set(metrics)):
+        old, new = baseline[name], metrics[name]
+        ratio = f"{new / old:.2f}x" if old else "-"
+        print(f"{name:<60} {old:>12} {new:>12} {ratio:>8}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", default="bench_results.json", help="where to write the JSON results")
+    parser.add_argument("--compare", metavar="BASELINE", help="print a comparison against an earlier results file")
+    parser.add_argument("--events", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--hotkeys", type=int, nargs="+", default=[5, 50, 500])
+    parser.add_argument("--lengths", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--skip-startup", action="store_true")
+    parser.add_argument("--startup-child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.startup_child:
+        startup_child()
+        return
+
+    prepare_environment()
+    from PyQt5.QtCore import QT_VERSION_STR, PYQT_VERSION_STR
+    import app
+
+    metrics = {}
+    application = app.Application()
+    bench_dispatch(application, args.events, args.hotkeys, metrics)
+    from config import load_config
+    application.on_config_saved(load_config())
+    bench_overlay_events(application.overlay, args.events, metrics)
+    bench_engine(application.config, args.events, metrics)
+    bench_render(application.config, args.lengths, metrics)
+    check_render_parity(application.config, metrics)
+    bench_config(metrics)
+    if not args.skip_startup:
+        bench_startup(metrics)
+    application.quit()
+
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "qt": QT_VERSION_STR,
+            "pyqt": PYQT_VERSION_STR,
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "metrics": metrics,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=4)
+    print(f"Wrote {len(metrics)} metrics to {args.output}")
+
+    if args.compare:
+        compare(args.compare, metrics)
+
+if __name__ == "__main__":
+    main()
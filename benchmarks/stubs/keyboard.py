@@ -0,0 +1,58 @@
+"""
+Stand-in for the keyboard library: no OS hook is installed, and key names map
+to fixed scan codes so hotkey tables compile the same way on every platform.
+"""
+
+KEY_DOWN = 'down'
+KEY_UP = 'up'
+
+_NAMES = (
+    ['esc'] + [str(i) for i in range(1, 10)] + ['0', '-', '=', 'backspace', 'tab']
+    + list('qwertyuiop') + ['[', ']', 'enter', 'ctrl'] + list('asdfghjkl') + [';', "'", '`', 'shift', '\\']
+    + list('zxcvbnm') + [',', '.', '/', 'right shift', '*', 'alt', 'space', 'caps lock']
+    + [f'f{i}' for i in range(1, 11)]
+)
+_SCAN_CODES = {name: (code,) for code, name in enumerate(_NAMES, start=1)}
+_SCAN_CODES.update({f'f{i}': (86 + i,) for i in range(11, 25)})
+_SCAN_CODES.update({
+    'left ctrl': _SCAN_CODES['ctrl'],
+    'right ctrl': _SCAN_CODES['ctrl'],
+    'left shift': _SCAN_CODES['shift'],
+    'shift': _SCAN_CODES['shift'] + _SCAN_CODES['right shift'],
+    'left alt': _SCAN_CODES['alt'],
+    'right alt': _SCAN_CODES['alt'],
+    'windows': (91, 92),
+    'left windows': (91,),
+    'right windows': (92,),
+    '+': _SCAN_CODES['='],
+    'plus': _SCAN_CODES['='],
+})
+_hooks = []
+
+class KeyboardEvent:
+    def __init__(self, event_type, scan_code, name=None, time=None):
+        self.event_type = event_type
+        self.scan_code = scan_code
+        self.name = name
+        self.time = time
+
+def key_to_scan_codes(key, error_if_missing=True):
+    try:
+        return _SCAN_CODES[key.lower()]
+    except KeyError:
+        if error_if_missing:
+            raise ValueError(f'Key {key!r} is not mapped to any known key.')
+        return ()
+
+def scan_code_names():
+    return {codes[0]: name for name, codes in _SCAN_CODES.items()}
+
+def hook(callback, suppress=False, on_remove=lambda: None):
+    _hooks.append(callback)
+    return callback
+
+def unhook(remove):
+    _hooks.remove(remove)
+
+def unhook_all():
+    _hooks.clear()
@@ -0,0 +1,6 @@
+"""Minimal stand-in for pywin32's win32con constants used by the overlay."""
+
+GWL_EXSTYLE = -20
+WS_EX_LAYERED = 0x00080000
+WS_EX_TRANSPARENT = 0x00000020
+WS_EX_NOACTIVATE = 0x08000000
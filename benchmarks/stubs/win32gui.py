@@ -0,0 +1,7 @@
+"""Minimal stand-in for pywin32's win32gui so the overlay can be created off Windows."""
+
+def GetWindowLong(hwnd, index):
+    return 0
+
+def SetWindowLong(hwnd, index, value):
+    return 0
@@ -1,11 +1,18 @@
 import json
 import copy
 import os
+import shutil
+import tempfile
+import threading
+import time
 
 APP_NAME = "PoE Maven Memory Game Helper"
 APPDATA_DIR = os.getenv('APPDATA')
 CONFIG_DIR = os.path.join(APPDATA_DIR, APP_NAME)
 CONFIG_FILE = os.path.join(CONFIG_DIR, "config.json")
+BACKUP_FILE = CONFIG_FILE + ".bak"
+CORRUPT_FILE = CONFIG_FILE + ".corrupt"
+DEFAULT_PROFILE = "Default"
 
 DEFAULT_CONFIG = {
     "hotkeys": {
@@ -14,7 +21,10 @@ DEFAULT_CONFIG = {
         'Sequence 3': 'f3',
         'Clear Sequence': 'f4',
         'Toggle Overlay': 'f5',
+        'Undo Last': 'f6',
+        'Next Profile': 'f7',
     },
+    "chord_timeout_ms": 1000,
     "sequence_actions": {
         'Sequence 1': 'Left',
         'Sequence 2': 'Top',
@@ -29,34 +39,211 @@ DEFAULT_CONFIG = {
         "background_color": "black",
         "font_size": 24,
         "separator": " -> ",
+        "renderer": "labels",
+        "max_visible": 20,
         "x": "center",
-        "y": 20
+        "y": 20,
+        "screen": None,
+        "screen_positions": {}
+    },
+    "focus": {
+        "processes": [],
+        "titles": []
     }
 }
 
+def _read_config_file(path):
+    with open(path, 'r') as f:
+        saved_config = json.load(f)
+    if not isinstance(saved_config, dict):
+        raise ValueError(f"{path} does not contain a JSON object")
+    return saved_config
+
+def _deep_merge(base, override):
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            _deep_merge(base[key], value)
+        else:
+            base[key] = value
+    return base
+
+def merge_with_defaults(saved_config):
+    """
+    Returns a full profile configuration, filling in anything saved_config
+    leaves out at any depth. Values are not checked here; see runtime_config.
+    """
+    return _deep_merge(copy.deepcopy(DEFAULT_CONFIG), saved_config)
+
+def default_profiles():
+    return {"active_profile": DEFAULT_PROFILE, "profiles": {DEFAULT_PROFILE: copy.deepcopy(DEFAULT_CONFIG)}}
+
+def _profiles_from_saved(saved_config):
+    """
+    Accepts either the profiles layout or a config.json written before
+    profiles existed, which becomes the single "Default" profile.
+    """
+    saved_profiles = saved_config.get("profiles")
+    if isinstance(saved_profiles, dict):
+        profiles = {name: merge_with_defaults(profile)
+                    for name, profile in saved_profiles.items() if isinstance(profile, dict)}
+    else:
+        profiles = {DEFAULT_PROFILE: merge_with_defaults(saved_config)}
+    if not profiles:
+        return default_profiles()
+    active = saved_config.get("active_profile")
+    if active not in profiles:
+        active = next(iter(profiles))
+    return {"active_profile": active, "profiles": profiles}
+
+def parse_profiles(text):
+    """Parses config.json text into the profiles layout, raising ValueError if it isn't usable."""
+    saved_config = json.loads(text)
+    if not isinstance(saved_config, dict):
+        raise ValueError("config.json does not contain a JSON object")
+    return _profiles_from_saved(saved_config)
+
+def read_profiles():
+    """
+    Loads every profile, merging each with the defaults, as
+    ({"active_profile": name, "profiles": {name: config}}, problem). Falls
+    back to the last-known-good backup, then the defaults, if config.json
+    is missing or corrupt. problem describes why config.json wasn't used,
+    or is None if it was or doesn't exist yet. A corrupt config.json is
+    copied to config.json.corrupt before the next save can replace it.
+    """
+    problem = None
+    for path in (CONFIG_FILE, BACKUP_FILE):
+        try:
+            saved_config = _read_config_file(path)
+        except FileNotFoundError:
+            continue
+        except (OSError, ValueError) as e:
+            if path == CONFIG_FILE:
+                problem = f"config.json could not be read ({e})"
+                try:
+                    shutil.copyfile(CONFIG_FILE, CORRUPT_FILE)
+                    problem += f"; it was copied to {CORRUPT_FILE}"
+                except OSError:
+                    pass
+            continue
+        if problem is not None:
+            problem += ". Using the last good backup."
+        return _profiles_from_saved(saved_config), problem
+    if problem is not None:
+        problem += ". Using the defaults."
+    return default_profiles(), problem
+
+def load_profiles():
+    """Like read_profiles(), without the problem description."""
+    return read_profiles()[0]
+
 def load_config():
-    """Loads configuration, merging saved settings with defaults."""
+    """Loads the active profile's configuration."""
+    profiles = load_profiles()
+    return profiles["profiles"][profiles["active_profile"]]
+
+def _write_atomic(path, text):
+    """Writes text to a temp file next to path and renames it over path."""
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".config-", suffix=".tmp")
     try:
-        with open(CONFIG_FILE, 'r') as f:
-            saved_config = json.load(f)
-            config = copy.deepcopy(DEFAULT_CONFIG)
-            for key, value in saved_config.items():
-                if isinstance(value, dict) and key in config:
-                    config[key].update(value)
-                else:
-                    config[key] = value
-            return config
-    except (FileNotFoundError, json.JSONDecodeError):
-        return copy.deepcopy(DEFAULT_CONFIG)
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
 
-def save_config(config):
-    """Saves configuration to a JSON file."""
+def _write_config_text(text):
+    """Atomically replaces config.json and refreshes the last-known-good backup. Returns False on failure."""
     try:
         if not os.path.exists(CONFIG_DIR):
             os.makedirs(CONFIG_DIR)
+        _write_atomic(CONFIG_FILE, text)
+        _write_atomic(BACKUP_FILE, text)
     except OSError:
-        # Failed to create the directory, so don't proceed.
-        return
+        return False
+    return True
+
+def save_config(config):
+    """Saves configuration (normally the whole profiles document) to a JSON file, blocking until it is written."""
+    _write_config_text(json.dumps(config, indent=4))
+
+class ConfigWriter:
+    """
+    Persists configuration on a background thread so the GUI thread never
+    waits on disk. Saves submitted within `delay` seconds of each other are
+    coalesced into a single write, and content identical to what is already
+    on disk is not rewritten.
+    """
+    def __init__(self, delay=0.5):
+        self.delay = delay
+        self._condition = threading.Condition()
+        self._pending = None
+        self._deadline = 0.0
+        self._writing = False
+        self._closed = False
+        self._last_written = None
+        self._thread = threading.Thread(target=self._run, name="ConfigWriter", daemon=True)
+        self._thread.start()
+
+    def save(self, config):
+        snapshot = copy.deepcopy(config)
+        with self._condition:
+            self._pending = snapshot
+            self._deadline = time.monotonic() + self.delay
+            self._condition.notify_all()
+
+    def flush(self):
+        """Writes any pending save immediately and waits for it to finish."""
+        with self._condition:
+            self._deadline = 0.0
+            self._condition.notify_all()
+            while self._pending is not None or self._writing:
+                self._condition.wait()
+
+    def close(self):
+        self.flush()
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+
+    @property
+    def last_written(self):
+        """The text of the latest write, so a file watcher can tell this process's own writes apart."""
+        return self._last_written
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._closed and (self._pending is None or time.monotonic() < self._deadline):
+                    timeout = None if self._pending is None else self._deadline - time.monotonic()
+                    self._condition.wait(timeout)
+                if self._pending is None:
+                    return
+                config, self._pending = self._pending, None
+                self._writing = True
+            try:
+                self._write(config)
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
 
-    with open(CONFIG_FILE, 'w') as f:
-        json.dump(config, f, indent=4)
+    def _write(self, config):
+        text = json.dumps(config, indent=4)
+        if self._last_written is None:
+            try:
+                with open(CONFIG_FILE, 'r') as f:
+                    self._last_written = f.read()
+            except OSError:
+                pass
+        if text == self._last_written:
+            return
+        if _write_config_text(text):
+            self._last_written = text
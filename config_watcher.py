@@ -0,0 +1,42 @@
+import os
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+POLL_INTERVAL_MS = 2000
+
+class ConfigWatcher(QObject):
+    """
+    Emits `changed` when a file's modification time or size changes. It polls
+    with os.stat on a timer instead of watching the file natively, because
+    config saves replace the file by rename, and native watches on Windows
+    and inotify stop following a file once it has been replaced.
+    """
+    changed = pyqtSignal()
+
+    def __init__(self, path, interval_ms=POLL_INTERVAL_MS, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self._signature = self._stat()
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.poll)
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def start(self):
+        self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+
+    def poll(self):
+        signature = self._stat()
+        if signature != self._signature:
+            self._signature = signature
+            if signature is not None:
+                self.changed.emit()
@@ -1,13 +1,36 @@
-from PyQt5.QtWidgets import (QLabel, QVBoxLayout, QPushButton, 
-                             QFormLayout, QLineEdit, QDialog, QHBoxLayout, QColorDialog, QFrame)
-from PyQt5.QtGui import QKeySequence, QColor, QFont, QIcon
-from PyQt5.QtCore import Qt, pyqtSignal, QPoint
+from PyQt5.QtWidgets import (QLabel, QVBoxLayout, QPushButton, QCheckBox, QScrollArea,
+                             QFormLayout, QLineEdit, QDialog, QHBoxLayout, QFrame)
+from PyQt5.QtGui import QKeySequence, QColor, QIcon, QGuiApplication
+from PyQt5.QtCore import Qt, pyqtSignal, QPoint, QTimer, QElapsedTimer
+
+from renderers import create_styled_strip
+from runtime_config import compile_profile
+
+PREVIEW_DELAY_MS = 150
 
 class HotkeyLineEdit(QLineEdit):
-    """A custom QLineEdit that captures a single hotkey combination."""
-    def __init__(self, hotkey_text, parent=None):
+    """
+    A custom QLineEdit that captures a hotkey combination. Combinations
+    pressed within chord_timeout_ms of each other are joined into one
+    multi-stroke hotkey, such as "g, 1".
+    """
+    capture_changed = pyqtSignal(bool)
+
+    def __init__(self, hotkey_text, parent=None, chord_timeout_ms=1000):
         super().__init__(hotkey_text, parent)
         self.setReadOnly(True)
+        self.chord_timeout_ms = chord_timeout_ms
+        self._last_stroke = QElapsedTimer()
+        self.setToolTip("Press a key combination. Press more keys right after it for a multi-stroke hotkey like g, 1.")
+
+    def focusInEvent(self, event):
+        super().focusInEvent(event)
+        self._last_stroke.invalidate()
+        self.capture_changed.emit(True)
+
+    def focusOutEvent(self, event):
+        super().focusOutEvent(event)
+        self.capture_changed.emit(False)
 
     def keyPressEvent(self, event):
         key = event.key()
@@ -25,6 +48,9 @@ class HotkeyLineEdit(QLineEdit):
         
         if len(pressed_key) != 1: return
         final_hotkey = '+'.join(pressed_modifiers + pressed_key)
+        if self._last_stroke.isValid() and not self._last_stroke.hasExpired(self.chord_timeout_ms):
+            final_hotkey = f"{self.text()}, {final_hotkey}"
+        self._last_stroke.start()
         self.setText(final_hotkey)
 
 class ColorPickerButton(QPushButton):
@@ -40,6 +66,7 @@ class ColorPickerButton(QPushButton):
 
     def open_color_dialog(self):
         """Creates a color dialog as a new top-level window to prevent style inheritance."""
+        from PyQt5.QtWidgets import QColorDialog
         dialog = QColorDialog()
         dialog.setCurrentColor(self._color)
         dialog.setOption(QColorDialog.DontUseNativeDialog)
@@ -66,58 +93,27 @@ class ColorPickerButton(QPushButton):
     def color_name(self):
         return self._color.name()
 
-class PositioningWindow(QDialog):
-    """A draggable, frameless dialog to set the position."""
-    position_set = pyqtSignal(int, int)
+def focus_to_text(focus):
+    return ", ".join(list(focus.get("processes", [])) + list(focus.get("titles", [])))
 
-    def __init__(self, style_config, icon, parent=None):
-        super().__init__(parent)
-        self.setWindowIcon(icon)
-            
-        self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool)
-        self.setAttribute(Qt.WA_TranslucentBackground)
-        
-        self.drag_position = None
-        layout = QVBoxLayout(self)
-        
-        self.preview_label = QLabel("Drag me to position, then click OK")
-        font_color = style_config.get('font_color', '#ffffff')
-        bg_color = style_config.get('background_color', 'black')
-        self.preview_label.setStyleSheet(f"color: {font_color}; background-color: {bg_color}; padding: 10px; border-radius: 5px;")
-        self.preview_label.setFont(QFont("Arial", style_config.get('font_size', 24), QFont.Bold))
-        
-        ok_button = QPushButton("OK")
-        ok_button.clicked.connect(self.accept_position)
-        
-        layout.addWidget(self.preview_label)
-        layout.addWidget(ok_button)
-        self.adjustSize()
-
-    def mousePressEvent(self, event):
-        if event.button() == Qt.LeftButton:
-            self.drag_position = event.globalPos() - self.frameGeometry().topLeft()
-            event.accept()
-
-    def mouseMoveEvent(self, event):
-        if event.buttons() == Qt.LeftButton and self.drag_position:
-            self.move(event.globalPos() - self.drag_position)
-            event.accept()
-
-    def accept_position(self):
-        final_geom = self.frameGeometry()
-        center_x = final_geom.center().x()
-        top_y = final_geom.top()
-        self.position_set.emit(center_x, top_y)
-        self.close()
+def focus_from_text(text):
+    """Splits a comma-separated target list: names ending in .exe are processes, the rest window titles."""
+    entries = [entry.strip() for entry in text.split(",") if entry.strip()]
+    return {
+        "processes": [entry for entry in entries if entry.lower().endswith(".exe")],
+        "titles": [entry for entry in entries if not entry.lower().endswith(".exe")],
+    }
 
 class ConfigWindow(QDialog):
     """Configuration window for setting hotkeys and styles."""
     config_saved = pyqtSignal(dict)
+    capture_changed = pyqtSignal(bool)
+    preview_changed = pyqtSignal(object)
 
-    def __init__(self, current_config, icon, parent=None):
+    def __init__(self, current_config, icon, parent=None, profile_name=None):
         super().__init__(parent)
         from config import DEFAULT_CONFIG 
-        self.setWindowTitle("Configure")
+        self.setWindowTitle(f"Configure - {profile_name}" if profile_name else "Configure")
         self.app_icon = icon
         self.setWindowIcon(self.app_icon)
 
@@ -129,6 +125,8 @@ class ConfigWindow(QDialog):
         self.inputs = {}
         self.new_pos_x = self.current_config['style'].get('x')
         self.new_pos_y = self.current_config['style'].get('y')
+        self.new_screen = self.current_config['style'].get('screen')
+        self.new_screen_positions = dict(self.current_config['style'].get('screen_positions') or {})
         self.pos_win = None
 
         main_layout = QVBoxLayout(self)
@@ -137,9 +135,13 @@ class ConfigWindow(QDialog):
         hotkeys = self.current_config.get("hotkeys", {})
         seq_actions = self.current_config.get("sequence_actions", {})
         font_colors = self.current_config.get("style", {}).get("font_colors", {})
+        chord_timeout_ms = self.current_config.get("chord_timeout_ms", DEFAULT_CONFIG["chord_timeout_ms"])
+        if not isinstance(chord_timeout_ms, int) or chord_timeout_ms <= 0:
+            chord_timeout_ms = DEFAULT_CONFIG["chord_timeout_ms"]
 
         for action, hotkey in hotkeys.items():
-            self.inputs[f"hotkey_{action}"] = HotkeyLineEdit(hotkey)
+            self.inputs[f"hotkey_{action}"] = HotkeyLineEdit(hotkey, chord_timeout_ms=chord_timeout_ms)
+            self.inputs[f"hotkey_{action}"].capture_changed.connect(self.capture_changed)
             form_layout.addRow(QLabel(f"Hotkey ({action}):"), self.inputs[f"hotkey_{action}"])
             
             if action in seq_actions:
@@ -150,6 +152,11 @@ class ConfigWindow(QDialog):
 
         self.inputs['background_color'] = ColorPickerButton(self.current_config['style'].get('background_color'))
         form_layout.addRow(QLabel("Background Color:"), self.inputs['background_color'])
+
+        self.inputs['focus'] = QLineEdit(focus_to_text(self.current_config.get('focus', {})))
+        self.inputs['focus'].setPlaceholderText("Any window (e.g. PathOfExile.exe, Path of Exile)")
+        self.inputs['focus'].setToolTip("Hotkeys only work while one of these programs (.exe) or window titles is focused.")
+        form_layout.addRow(QLabel("Only Active In:"), self.inputs['focus'])
         
         set_position_button = QPushButton("Set Position")
         set_position_button.clicked.connect(self.open_positioning_mode)
@@ -160,16 +167,28 @@ class ConfigWindow(QDialog):
         separator.setFrameShadow(QFrame.Sunken)
         form_layout.addRow(separator)
 
-        self.preview_label = QLabel("Preview")
-        self.preview_label.setAlignment(Qt.AlignCenter)
-        self.preview_label.setFont(QFont("Arial", 16, QFont.Bold))
-        form_layout.addRow(self.preview_label)
-        
+        self.preview_strip = None
+        self._preview_key = None
+        self.preview_area = QScrollArea()
+        self.preview_area.setFrameShape(QFrame.NoFrame)
+        self.preview_area.setAlignment(Qt.AlignCenter)
+        self.preview_area.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        form_layout.addRow(self.preview_area)
+
+        self.overlay_preview = QCheckBox("Preview on overlay")
+        self.overlay_preview.toggled.connect(self.on_overlay_preview_toggled)
+        form_layout.addRow(self.overlay_preview)
+
+        # Edits only restart this timer, so a burst of typing re-lays out the preview once.
+        self._preview_timer = QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(PREVIEW_DELAY_MS)
+        self._preview_timer.timeout.connect(self.update_preview)
         for key, field in self.inputs.items():
             if isinstance(field, ColorPickerButton):
-                field.color_changed.connect(self.update_preview)
-            elif isinstance(field, QLineEdit):
-                field.textChanged.connect(self.update_preview)
+                field.color_changed.connect(self._preview_timer.start)
+            elif isinstance(field, QLineEdit) and key.startswith("text_"):
+                field.textChanged.connect(self._preview_timer.start)
         
         self.update_preview()
 
@@ -191,6 +210,7 @@ class ConfigWindow(QDialog):
         self.setFixedSize(self.sizeHint())
 
     def open_positioning_mode(self):
+        from positioning_window import PositioningWindow
         self.hide() 
         temp_style_config = {
             'font_color': '#ffffff',
@@ -201,33 +221,44 @@ class ConfigWindow(QDialog):
         self.pos_win.setWindowModality(Qt.ApplicationModal)
         self.pos_win.position_set.connect(self.on_position_set)
         self.pos_win.finished.connect(self.show)
+        self.pos_win.finished.connect(self.pos_win.deleteLater)
         self.pos_win.show()
 
     def on_position_set(self, x, y):
-        self.new_pos_x = x
-        self.new_pos_y = y
+        """Pins the overlay to the screen it was dropped on, storing the position relative to that screen."""
+        screen = QGuiApplication.screenAt(QPoint(x, y)) or QGuiApplication.primaryScreen()
+        geometry = screen.geometry()
+        self.new_pos_x = x - geometry.x()
+        self.new_pos_y = y - geometry.y()
+        self.new_screen = screen.name()
+        self.new_screen_positions[self.new_screen] = {'x': self.new_pos_x, 'y': self.new_pos_y}
+        self.update_preview()
 
     def update_preview(self):
-        html_parts = []
-        for i in range(1, 4):
-            action = f"Sequence {i}"
-            text_widget = self.inputs.get(f"text_{action}")
-            color_widget = self.inputs.get(f"color_{action}")
-            if text_widget and color_widget:
-                text = text_widget.text()
-                color = color_widget.color_name()
-                html_parts.append(f"<font color='{color}'>{text}</font>")
-        
-        separator_html = f"<font color='white'> -> </font>"
-        preview_text = separator_html.join(html_parts)
-        
-        bg_color_widget = self.inputs.get('background_color')
-        if bg_color_widget:
-            bg_color = bg_color_widget.color_name()
-            self.preview_label.setText(preview_text)
-            self.preview_label.setStyleSheet(f"background-color: {bg_color}; padding: 10px; border-radius: 5px;")
-
-    def save_config(self):
+        """Draws one of each sequence token through the same renderer and styling as the overlay."""
+        self._preview_timer.stop()
+        config = self.build_config()
+        profile = compile_profile(config)
+        key = profile.style_key
+        if key != self._preview_key:
+            strip = create_styled_strip(key)
+            strip.set_sequence(list(range(len(profile.tokens))))
+            self.preview_area.setWidget(strip)
+            self.preview_strip = strip
+            self._preview_key = key
+            scroll_bar = self.preview_area.horizontalScrollBar().sizeHint().height()
+            self.preview_area.setFixedHeight(strip.sizeHint().height() + scroll_bar)
+        if self.overlay_preview.isChecked():
+            self.preview_changed.emit(config)
+
+    def on_overlay_preview_toggled(self, checked):
+        if checked:
+            self.update_preview()
+        else:
+            self.preview_changed.emit(None)
+
+    def build_config(self):
+        """Returns the configuration the dialog's fields currently describe."""
         new_config = { "hotkeys": {}, "sequence_actions": {}, "style": {"font_colors": {}} }
         
         for key, field in self.inputs.items():
@@ -242,13 +273,23 @@ class ConfigWindow(QDialog):
                 new_config["style"]["font_colors"][action] = field.color_name()
             elif key == "background_color":
                 new_config["style"]["background_color"] = field.color_name()
+            elif key == "focus":
+                new_config["focus"] = focus_from_text(field.text())
         
         new_config['style']['x'] = self.new_pos_x
         new_config['style']['y'] = self.new_pos_y
+        new_config['style']['screen'] = self.new_screen
+        new_config['style']['screen_positions'] = self.new_screen_positions
         new_config['style']['font_size'] = self.current_config['style'].get('font_size')
         new_config['style']['separator'] = self.current_config['style'].get('separator')
+        new_config['style']['renderer'] = self.current_config['style'].get('renderer')
+        new_config['style']['max_visible'] = self.current_config['style'].get('max_visible')
+        if 'chord_timeout_ms' in self.current_config:
+            new_config['chord_timeout_ms'] = self.current_config['chord_timeout_ms']
+        return new_config
 
-        self.config_saved.emit(new_config)
+    def save_config(self):
+        self.config_saved.emit(self.build_config())
         self.accept()
 
     def revert_defaults(self, defaults):
@@ -276,9 +317,13 @@ class ConfigWindow(QDialog):
             default_bg_color = defaults.get('style', {}).get('background_color')
             if bg_color_widget and default_bg_color:
                 bg_color_widget.set_color(default_bg_color)
+
+            self.inputs['focus'].setText(focus_to_text(defaults.get('focus', {})))
             
             self.new_pos_x = defaults.get('style', {}).get('x', 'center')
             self.new_pos_y = defaults.get('style', {}).get('y', 20)
+            self.new_screen = defaults.get('style', {}).get('screen')
+            self.new_screen_positions = {}
         
         finally:
             for widget in self.inputs.values():
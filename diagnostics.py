@@ -0,0 +1,200 @@
+import cProfile
+import gc
+import json
+import logging
+import logging.handlers
+import os
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+from PyQt5.QtCore import QObject, QTimer
+from PyQt5.QtWidgets import QApplication
+
+SAMPLE_INTERVAL_MS = 60000
+TOP_ALLOCATIONS = 10
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUPS = 5
+
+def current_rss():
+    """Resident set size of this process in bytes, or None if it can't be read."""
+    if sys.platform == 'win32':
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD)] + [
+                (name, ctypes.c_size_t) for name in (
+                    'PeakWorkingSetSize', 'WorkingSetSize', 'QuotaPeakPagedPoolUsage', 'QuotaPagedPoolUsage',
+                    'QuotaPeakNonPagedPoolUsage', 'QuotaNonPagedPoolUsage', 'PagefileUsage', 'PeakPagefileUsage')]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        get_current_process = ctypes.windll.kernel32.GetCurrentProcess
+        get_current_process.restype = wintypes.HANDLE
+        get_memory_info = ctypes.windll.psapi.GetProcessMemoryInfo
+        get_memory_info.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESS_MEMORY_COUNTERS), wintypes.DWORD]
+        if not get_memory_info(get_current_process(), ctypes.byref(counters), counters.cb):
+            return None
+        return counters.WorkingSetSize
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+def qt_object_counts():
+    """Live widgets by class name, plus every QObject reachable from the top-level widgets."""
+    widgets = QApplication.allWidgets()
+    counts = Counter(type(widget).__name__ for widget in widgets)
+    top_level = QApplication.topLevelWidgets()
+    return {
+        "widgets": len(widgets),
+        "top_level_widgets": len(top_level),
+        "objects": sum(1 + len(widget.findChildren(QObject)) for widget in top_level),
+        "widgets_by_class": dict(counts.most_common()),
+    }
+
+class PathProfiler:
+    """
+    Profiles the two hot paths. The GUI thread (action handling, flushes and
+    painting) runs under cProfile. The keyboard hook runs on its own thread,
+    and Python 3.12+ allows only one active profiler, so its handler is
+    timed with perf_counter_ns instead of a second cProfile.
+    """
+    def __init__(self):
+        self.gui = cProfile.Profile()
+        self.hook_calls = 0
+        self.hook_total_ns = 0
+        self.hook_max_ns = 0
+
+    def wrap(self, handler):
+        perf_counter_ns = time.perf_counter_ns
+
+        def timed_handler(event):
+            start = perf_counter_ns()
+            try:
+                return handler(event)
+            finally:
+                elapsed = perf_counter_ns() - start
+                self.hook_calls += 1
+                self.hook_total_ns += elapsed
+                if elapsed > self.hook_max_ns:
+                    self.hook_max_ns = elapsed
+        return timed_handler
+
+    def start(self):
+        """Raises ValueError if another profiler (a debugger, say) is already active."""
+        self.gui.enable()
+
+    def stop(self, directory):
+        """
+        Stops profiling and writes a pstats file for the GUI thread and a
+        JSON summary of the hook timings; returns their paths.
+        """
+        self.gui.disable()
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        gui_path = os.path.join(directory, f"profile-{stamp}-gui.prof")
+        self.gui.dump_stats(gui_path)
+        hook_path = os.path.join(directory, f"profile-{stamp}-hook.json")
+        with open(hook_path, 'w') as f:
+            json.dump({
+                "calls": self.hook_calls,
+                "mean_us": round(self.hook_total_ns / self.hook_calls / 1000, 1) if self.hook_calls else 0,
+                "max_us": round(self.hook_max_ns / 1000, 1),
+            }, f, indent=2)
+        return [gui_path, hook_path]
+
+class Diagnostics(QObject):
+    """
+    Samples process health while the tray app runs: RSS, CPU use since the
+    last sample, live Qt widget and object counts, Python object count, and
+    the top tracemalloc allocation sites with their growth since the previous
+    sample. Each sample is one JSON line in a size-rotated log in `directory`,
+    so a long session can be diffed sample by sample. Each entry in `sources`
+    maps a name to a callable whose JSON-ready result is added to every
+    sample under that name.
+    """
+    def __init__(self, directory, interval_ms=SAMPLE_INTERVAL_MS, parent=None):
+        super().__init__(parent)
+        self.directory = directory
+        self.log_path = os.path.join(directory, "diagnostics.jsonl")
+        self.samples = 0
+        self.sources = {}
+        self._previous_snapshot = None
+        self._previous_cpu = None
+        self._started_tracemalloc = False
+        self._logger = None
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.sample)
+
+    @property
+    def running(self):
+        return self._timer.isActive()
+
+    def start(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self._logger = logging.getLogger("maven.diagnostics")
+        self._logger.propagate = False
+        self._logger.setLevel(logging.INFO)
+        handler = logging.handlers.RotatingFileHandler(self.log_path, maxBytes=LOG_MAX_BYTES,
+                                                       backupCount=LOG_BACKUPS, encoding='utf-8')
+        self._logger.addHandler(handler)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self._previous_cpu = (time.monotonic(), time.process_time())
+        self._timer.start()
+        self.sample()
+
+    def stop(self):
+        self._timer.stop()
+        if self._logger is not None:
+            for handler in list(self._logger.handlers):
+                self._logger.removeHandler(handler)
+                handler.close()
+            self._logger = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        self._previous_snapshot = None
+
+    def sample(self):
+        """Takes one sample and appends it to the log."""
+        wall, cpu = time.monotonic(), time.process_time()
+        previous_wall, previous_cpu = self._previous_cpu
+        self._previous_cpu = (wall, cpu)
+
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ))
+        traced, peak = tracemalloc.get_traced_memory()
+        record = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "sample": self.samples,
+            "rss_bytes": current_rss(),
+            "cpu_percent": round(100 * (cpu - previous_cpu) / max(wall - previous_wall, 1e-6), 2),
+            "python_objects": len(gc.get_objects()),
+            "qt": qt_object_counts(),
+            "traced_bytes": traced,
+            "traced_peak_bytes": peak,
+            "top_allocations": [
+                {"site": str(stat.traceback), "bytes": stat.size, "count": stat.count}
+                for stat in snapshot.statistics('lineno')[:TOP_ALLOCATIONS]
+            ],
+        }
+        for name, source in self.sources.items():
+            record[name] = source()
+        if self._previous_snapshot is not None:
+            record["top_growth"] = [
+                {"site": str(stat.traceback), "bytes_diff": stat.size_diff, "count_diff": stat.count_diff}
+                for stat in snapshot.compare_to(self._previous_snapshot, 'lineno')[:TOP_ALLOCATIONS]
+            ]
+        self._previous_snapshot = snapshot
+        self.samples += 1
+        if self._logger is not None:
+            self._logger.info(json.dumps(record))
+        return record
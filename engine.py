@@ -0,0 +1,254 @@
+"""
+The sequence logic without any Qt: hotkey resolution, the sequence itself,
+the toggle/clear/undo actions, per-profile state and the model the overlay
+draws from. Importing this pulls in only hotkeys, sequence_buffer and journal, so
+tools and benchmarks can drive it headlessly.
+"""
+from hotkeys import HotkeyDispatcher
+from journal import OP_PUSH, OP_POP
+from sequence_buffer import SequenceBuffer, DEFAULT_CAPACITY
+
+UNKNOWN_CODE = 0xFF
+
+class RenderModel:
+    """
+    What the view has to change. If `rebuild` is set, `codes` is the whole
+    visible tail and `hidden` the number of older entries not shown;
+    otherwise `codes` only holds entries to append to what is already shown.
+    """
+    __slots__ = ('visible', 'rebuild', 'codes', 'hidden')
+
+    def __init__(self, visible, rebuild, codes, hidden):
+        self.visible = visible
+        self.rebuild = rebuild
+        self.codes = codes
+        self.hidden = hidden
+
+def remap_codes(sequence, old_names, new_names):
+    """Re-codes a sequence in place from one list of action names to another."""
+    if not sequence:
+        return
+    new_codes = {action_name: code for code, action_name in enumerate(new_names)}
+    evicted = sequence.evicted
+    old_codes = sequence.tail(len(sequence))
+    sequence.clear()
+    for code in old_codes:
+        action_name = old_names[code] if code < len(old_names) else None
+        sequence.push(new_codes.get(action_name, UNKNOWN_CODE))
+    sequence.evicted = evicted
+
+class SequenceEngine:
+    """
+    Owns the sequence state for every profile. `profile` is anything with
+    the RuntimeProfile attributes hotkeys, action_names, action_codes and
+    max_visible. Whenever the displayed state changes, on_change() is called
+    so a view can schedule a redraw and collect render_model().
+
+    With a `journal` (a SequenceJournal), every profile's sequence is
+    restored from it and each push, pop and clear is recorded to it.
+
+    While a preview stands in for the sequence, actions still go to the
+    real sequence behind it (and its journal); they show once the preview
+    ends.
+    """
+    def __init__(self, profile, profile_name=None, capacity=DEFAULT_CAPACITY, journal=None):
+        self.dispatcher = HotkeyDispatcher()
+        self.capacity = capacity
+        self.profile = None
+        self.profile_name = profile_name
+        self.sequence = SequenceBuffer(capacity)
+        self.action_names = ()
+        self.action_codes = {}
+        self.max_visible = capacity
+        self.enabled = True
+        self.on_change = None
+        self.journal = journal
+        self._profile_states = {}
+        self._preview_restore = None
+        self._pending = []
+        self._needs_rebuild = True
+        self.sequence, self.action_names = self._restore(profile_name)
+        self.apply_profile(profile)
+        self._compact_journal()
+
+    def _changed(self, rebuild=True):
+        if rebuild:
+            self._needs_rebuild = True
+        if self.on_change is not None:
+            self.on_change()
+
+    def apply_profile(self, profile):
+        """Uses a compiled profile's hotkeys and actions for the current sequence."""
+        self.dispatcher.set_table(profile.hotkeys)
+        self._use_profile(profile)
+
+    def update_profile(self, profile, changes):
+        """Like apply_profile, but only redoes what profile_changes() reported."""
+        if "hotkeys" in changes:
+            self.dispatcher.set_table(profile.hotkeys)
+        if self._preview_restore is not None:
+            _, sequence, action_names = self._preview_restore
+            self._preview_restore = (profile, sequence, profile.action_names)
+            if profile.action_names != action_names:
+                remap_codes(sequence, action_names, profile.action_names)
+                self._compact_journal()
+        elif changes & {"actions", "layout"}:
+            self._use_profile(profile)
+        else:
+            self.profile = profile
+            self.action_codes = profile.action_codes
+
+    def _use_profile(self, profile):
+        self.profile = profile
+        self.max_visible = profile.max_visible or self.capacity
+        if profile.action_names != self.action_names:
+            self._remap_sequence(profile.action_names)
+        self.action_codes = profile.action_codes
+        self._changed()
+
+    def _remap_sequence(self, action_names):
+        """Re-codes the stored sequence when the set or order of sequence actions changes."""
+        remap_codes(self.sequence, self.action_names, action_names)
+        self.action_names = action_names
+        self._compact_journal()
+
+    def _restore(self, profile_name):
+        """A profile's sequence and the action names its codes refer to, from the journal if there is one."""
+        sequence = SequenceBuffer(self.capacity)
+        restored = self.journal.restore(profile_name) if self.journal is not None else None
+        if restored is None:
+            return sequence, ()
+        action_names, codes, evicted = restored
+        for code in codes:
+            sequence.push(code)
+        sequence.evicted += evicted
+        return sequence, tuple(action_names)
+
+    def _live(self):
+        """The real sequence and the action codes it uses, also while a preview is shown."""
+        if self._preview_restore is None:
+            return self.sequence, self.action_codes
+        profile, sequence, _ = self._preview_restore
+        return sequence, profile.action_codes
+
+    def _journal(self, op, code=0):
+        if self.journal is not None:
+            if self.journal.record(self.profile_name, op, code):
+                self._compact_journal()
+
+    def _compact_journal(self):
+        if self.journal is not None:
+            if self._preview_restore is None:
+                sequence, action_names = self.sequence, self.action_names
+            else:
+                _, sequence, action_names = self._preview_restore
+            self.journal.reset(self.profile_name, action_names, sequence.tail(len(sequence)), sequence.evicted)
+
+    def switch_profile(self, profile_name, profile):
+        """Makes another profile current; each profile keeps its own sequence."""
+        if profile_name == self.profile_name:
+            return
+        self.end_preview()
+        self._profile_states[self.profile_name] = (self.sequence, self.action_names)
+        self.profile_name = profile_name
+        state = self._profile_states.pop(profile_name, None)
+        self.sequence, self.action_names = state if state is not None else self._restore(profile_name)
+        self.apply_profile(profile)
+
+    def restore_profiles(self, profile_names):
+        """
+        Reads the journals of profiles not restored yet, so switching to
+        them later is a swap in memory rather than a read on the GUI thread.
+        """
+        for profile_name in profile_names:
+            if profile_name != self.profile_name and profile_name not in self._profile_states:
+                self._profile_states[profile_name] = self._restore(profile_name)
+
+    def forget_profile(self, profile_name):
+        self._profile_states.pop(profile_name, None)
+        if self.journal is not None:
+            self.journal.discard(profile_name)
+
+    def show_preview(self, profile):
+        """
+        Stands one of each of a profile's sequence tokens in for the real
+        sequence until end_preview(). Hotkeys are left as they are, and
+        their actions still apply to the real sequence.
+        """
+        if self._preview_restore is None:
+            self._preview_restore = (self.profile, self.sequence, self.action_names)
+        self.sequence = SequenceBuffer(self.capacity)
+        for code in range(len(profile.action_names)):
+            self.sequence.push(code)
+        self.action_names = profile.action_names
+        self._use_profile(profile)
+
+    def end_preview(self):
+        if self._preview_restore is None:
+            return
+        profile, self.sequence, self.action_names = self._preview_restore
+        self._preview_restore = None
+        self._use_profile(profile)
+
+    @property
+    def previewing(self):
+        return self._preview_restore is not None
+
+    def feed(self, scan_code, is_down):
+        """Resolves and applies a key event on one thread; returns the action, if any."""
+        action = self.dispatcher.feed(scan_code, is_down)
+        if action is not None:
+            self.apply(action)
+        return action
+
+    def apply(self, action):
+        """Applies a resolved action. Returns False for actions the engine doesn't handle."""
+        sequence, action_codes = self._live()
+        shown = sequence is self.sequence
+        code = action_codes.get(action)
+        if action == 'Toggle Overlay':
+            self.toggle_enabled()
+        elif code is not None:
+            if self.enabled:
+                sequence.push(code)
+                self._journal(OP_PUSH, code)
+                if shown:
+                    self._pending.append(code)
+                    self._changed(rebuild=False)
+        elif action == 'Clear Sequence':
+            if self.enabled:
+                sequence.clear()
+                self._compact_journal()
+                if shown:
+                    self._changed()
+        elif action == 'Undo Last':
+            if self.enabled and sequence.pop() is not None:
+                self._journal(OP_POP)
+                if shown:
+                    self._changed()
+        else:
+            return False
+        return True
+
+    def toggle_enabled(self):
+        self.set_enabled(not self.enabled)
+
+    def set_enabled(self, enabled):
+        if enabled != self.enabled:
+            self.enabled = enabled
+            self._changed()
+
+    def render_model(self, incremental=True):
+        """
+        Returns the changes since the last call. Pass incremental=False when
+        the view has nothing on screen to append to.
+        """
+        pending, self._pending = self._pending, []
+        rebuild = self._needs_rebuild or not incremental or self.sequence.total > self.max_visible
+        self._needs_rebuild = False
+        if not (self.enabled and self.sequence):
+            return RenderModel(False, True, (), 0)
+        if rebuild:
+            codes = self.sequence.tail(self.max_visible)
+            return RenderModel(True, True, codes, self.sequence.total - len(codes))
+        return RenderModel(True, False, pending, 0)
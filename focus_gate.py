@@ -0,0 +1,152 @@
+import os
+import sys
+
+class StaticFocusProvider:
+    """
+    Focus provider that reports whatever it is told. Used off Windows, and by
+    the tests to simulate focus changes.
+    """
+    def __init__(self, process="", title=""):
+        self.foreground = (process, title)
+        self._callback = None
+
+    def start(self, callback):
+        self._callback = callback
+        callback(*self.foreground)
+
+    def stop(self):
+        self._callback = None
+
+    def set_foreground(self, process, title=""):
+        self.foreground = (process, title)
+        if self._callback is not None:
+            self._callback(process, title)
+
+class Win32FocusProvider:
+    """
+    Reports the foreground window's process name and title through a
+    SetWinEventHook(EVENT_SYSTEM_FOREGROUND) hook. The hook is out of
+    context, so its callback is delivered on the thread that installed it.
+    That thread must run a message loop; the Qt GUI thread does. Title
+    changes within an already focused window are not reported.
+    """
+    EVENT_SYSTEM_FOREGROUND = 0x0003
+    WINEVENT_OUTOFCONTEXT = 0x0000
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+
+    def __init__(self):
+        import ctypes
+        from ctypes import wintypes
+        self._ctypes = ctypes
+        self._user32 = ctypes.windll.user32
+        self._kernel32 = ctypes.windll.kernel32
+        self._proc_type = ctypes.WINFUNCTYPE(None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND, wintypes.LONG,
+                                             wintypes.LONG, wintypes.DWORD, wintypes.DWORD)
+        self._user32.SetWinEventHook.restype = wintypes.HANDLE
+        self._user32.SetWinEventHook.argtypes = [wintypes.DWORD, wintypes.DWORD, wintypes.HMODULE, self._proc_type,
+                                                 wintypes.DWORD, wintypes.DWORD, wintypes.DWORD]
+        self._user32.UnhookWinEvent.argtypes = [wintypes.HANDLE]
+        self._user32.GetForegroundWindow.restype = wintypes.HWND
+        self._user32.GetWindowTextLengthW.argtypes = [wintypes.HWND]
+        self._user32.GetWindowTextW.argtypes = [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]
+        self._user32.GetWindowThreadProcessId.argtypes = [wintypes.HWND, ctypes.POINTER(wintypes.DWORD)]
+        self._kernel32.OpenProcess.restype = wintypes.HANDLE
+        self._kernel32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+        self._kernel32.QueryFullProcessImageNameW.argtypes = [wintypes.HANDLE, wintypes.DWORD, wintypes.LPWSTR,
+                                                              ctypes.POINTER(wintypes.DWORD)]
+        self._kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+        self._hook = None
+        self._proc = None
+        self._callback = None
+
+    def start(self, callback):
+        self._callback = callback
+        # The ctypes callback object must outlive the hook.
+        self._proc = self._proc_type(self._on_event)
+        self._hook = self._user32.SetWinEventHook(self.EVENT_SYSTEM_FOREGROUND, self.EVENT_SYSTEM_FOREGROUND, None,
+                                                  self._proc, 0, 0, self.WINEVENT_OUTOFCONTEXT)
+        callback(*self._describe(self._user32.GetForegroundWindow()))
+
+    def stop(self):
+        if self._hook:
+            self._user32.UnhookWinEvent(self._hook)
+        self._hook = None
+        self._proc = None
+        self._callback = None
+
+    def _on_event(self, hook, event, hwnd, object_id, child_id, thread_id, event_time):
+        if self._callback is not None:
+            self._callback(*self._describe(hwnd))
+
+    def _describe(self, hwnd):
+        """Returns (process file name, window title) for a window handle."""
+        if not hwnd:
+            return "", ""
+        ctypes = self._ctypes
+        from ctypes import wintypes
+        length = self._user32.GetWindowTextLengthW(hwnd)
+        title = ctypes.create_unicode_buffer(length + 1)
+        self._user32.GetWindowTextW(hwnd, title, length + 1)
+
+        pid = wintypes.DWORD()
+        self._user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+        process = ""
+        handle = self._kernel32.OpenProcess(self.PROCESS_QUERY_LIMITED_INFORMATION, False, pid.value)
+        if handle:
+            try:
+                path = ctypes.create_unicode_buffer(1024)
+                size = wintypes.DWORD(len(path))
+                if self._kernel32.QueryFullProcessImageNameW(handle, 0, path, ctypes.byref(size)):
+                    process = os.path.basename(path.value)
+            finally:
+                self._kernel32.CloseHandle(handle)
+        return process, title.value
+
+def create_provider():
+    """The foreground-window provider for this platform."""
+    if sys.platform == 'win32':
+        return Win32FocusProvider()
+    return StaticFocusProvider()
+
+class FocusGate:
+    """
+    Tracks whether a target window is in the foreground. The answer is worked
+    out only when a focus change is reported, or when the targets change, and
+    cached in `allowed` for the keyboard hook to read. With no targets the
+    gate is always open.
+    """
+    def __init__(self, provider, on_change=None):
+        self.provider = provider
+        self.on_change = on_change
+        self.processes = frozenset()
+        self.titles = ()
+        self.foreground = ("", "")
+        self.allowed = True
+
+    def start(self):
+        self.provider.start(self._on_foreground)
+
+    def stop(self):
+        self.provider.stop()
+
+    def set_targets(self, processes, titles):
+        """processes match the executable name exactly and titles match as substrings, both ignoring case."""
+        self.processes = frozenset(process.lower() for process in processes)
+        self.titles = tuple(title.lower() for title in titles)
+        self._update()
+
+    def _on_foreground(self, process, title):
+        self.foreground = (process, title)
+        self._update()
+
+    def _update(self):
+        if not self.processes and not self.titles:
+            allowed = True
+        else:
+            process, title = self.foreground
+            title = title.lower()
+            allowed = process.lower() in self.processes or any(target in title for target in self.titles)
+        if allowed != self.allowed:
+            self.allowed = allowed
+            if self.on_change is not None:
+                self.on_change(allowed)
@@ -0,0 +1,264 @@
+import itertools
+import time
+
+MOD_CTRL = 1
+MOD_SHIFT = 2
+MOD_ALT = 4
+MOD_WINDOWS = 8
+
+MODIFIER_BITS = {
+    'ctrl': MOD_CTRL,
+    'left ctrl': MOD_CTRL,
+    'right ctrl': MOD_CTRL,
+    'shift': MOD_SHIFT,
+    'left shift': MOD_SHIFT,
+    'right shift': MOD_SHIFT,
+    'alt': MOD_ALT,
+    'left alt': MOD_ALT,
+    'right alt': MOD_ALT,
+    'alt gr': MOD_ALT,
+    'windows': MOD_WINDOWS,
+    'left windows': MOD_WINDOWS,
+    'right windows': MOD_WINDOWS,
+}
+
+ALL_MODIFIERS = MOD_CTRL | MOD_SHIFT | MOD_ALT | MOD_WINDOWS
+DEFAULT_CHORD_TIMEOUT = 1.0
+
+def _keyboard_scan_codes(name):
+    import keyboard
+    return keyboard.key_to_scan_codes(name)
+
+def split_hotkey(hotkey_str):
+    """Splits 'ctrl+shift+x' into its key names, keeping a literal '+' key intact."""
+    hotkey_str = hotkey_str.strip().lower()
+    if hotkey_str == '+':
+        return ['+']
+    if hotkey_str.endswith('++'):
+        return [p.strip() for p in hotkey_str[:-2].split('+')] + ['+']
+    return [p.strip() for p in hotkey_str.split('+') if p.strip()]
+
+def split_strokes(hotkey_str):
+    """
+    Splits a multi-stroke hotkey like 'g, 1' into its strokes. A ',' that
+    starts a stroke or follows a '+' is the comma key, so 'ctrl+,' and
+    'g, ,' (g, then comma) read the way they are captured.
+    """
+    strokes = []
+    current = ''
+    for char in hotkey_str:
+        stroke = current.strip()
+        if char == ',' and stroke and not stroke.endswith('+'):
+            strokes.append(stroke)
+            current = ''
+        else:
+            current += char
+    strokes.append(current.strip())
+    return strokes
+
+class ChordNode(dict):
+    """
+    A prefix in the hotkey trie: the keys that may follow it, mapped like the
+    root index to an action name or a further ChordNode.
+    """
+    __slots__ = ()
+
+def expand_modifiers(node):
+    """
+    Re-keys a trie level by every possible set of held modifiers: (scan code,
+    held mask) maps to the binding for that key whose modifiers are the
+    largest subset of the held ones, so ctrl+x still fires while shift is
+    also down. An exact match always wins; between equally specific
+    bindings the higher mask does. ChordNodes are expanded the same way.
+    """
+    by_scan_code = {}
+    for (scan_code, mask), target in node.items():
+        if isinstance(target, ChordNode):
+            target = expand_modifiers(target)
+        by_scan_code.setdefault(scan_code, []).append((mask, target))
+    expanded = ChordNode() if isinstance(node, ChordNode) else {}
+    for scan_code, bindings in by_scan_code.items():
+        bindings.sort(key=lambda binding: (bin(binding[0]).count('1'), binding[0]), reverse=True)
+        for held in range(ALL_MODIFIERS + 1):
+            for mask, target in bindings:
+                if mask & held == mask:
+                    expanded[(scan_code, held)] = target
+                    break
+    return expanded
+
+class HotkeyTable:
+    """
+    Immutable lookup table compiled from the "hotkeys" config section.
+    `index` maps (trigger scan code, modifier bitmask) to an action name or,
+    for the first strokes of multi-stroke hotkeys, to a ChordNode holding the
+    rest. `lookup` is the same trie expanded by expand_modifiers(), so the
+    dispatcher needs one dict lookup per key.
+    """
+    __slots__ = ('index', 'lookup', 'modifier_scan_codes', 'errors', 'chord_timeout')
+
+    def __init__(self, index, modifier_scan_codes, errors, chord_timeout=DEFAULT_CHORD_TIMEOUT):
+        self.index = index
+        self.lookup = expand_modifiers(index)
+        self.modifier_scan_codes = modifier_scan_codes
+        self.errors = errors
+        self.chord_timeout = chord_timeout
+
+    def __len__(self):
+        return len(self.index)
+
+def _compile_stroke(stroke, scan_codes_for):
+    """Returns (trigger scan codes, modifier mask) for one stroke such as 'ctrl+x'."""
+    if not stroke:
+        raise ValueError("a stroke is empty")
+    if stroke.endswith('+') and not (stroke == '+' or stroke.endswith('++')):
+        raise ValueError(f"'{stroke}' has no key after its last '+'")
+    *modifier_names, trigger = split_hotkey(stroke)
+    mask = 0
+    for name in modifier_names:
+        if name not in MODIFIER_BITS:
+            raise ValueError(f"'{name}' is not a modifier key")
+        mask |= MODIFIER_BITS[name]
+    return scan_codes_for(trigger), mask
+
+def _insert(index, path, action):
+    """Adds one key path to the trie. Returns the action blocking it if a prefix is already bound."""
+    node = index
+    for key in path[:-1]:
+        child = node.get(key)
+        if child is None:
+            child = node[key] = ChordNode()
+        elif not isinstance(child, ChordNode):
+            return child
+        node = child
+    node[path[-1]] = action
+    return None
+
+def compile_hotkeys(hotkeys, scan_codes_for=None, chord_timeout=DEFAULT_CHORD_TIMEOUT):
+    """
+    Compiles {action: hotkey_str} into a HotkeyTable.
+    scan_codes_for(name) resolves a key name to its scan codes and defaults to the
+    keyboard library; hotkeys that fail to resolve are listed in table.errors.
+
+    Multi-stroke hotkeys ('g, 1') are stored as a trie. A hotkey can't also
+    be the start of a longer one: the shorter one always wins, and the
+    longer one is reported in table.errors and left out.
+    """
+    if scan_codes_for is None:
+        scan_codes_for = _keyboard_scan_codes
+
+    modifier_scan_codes = {}
+    for name, bit in MODIFIER_BITS.items():
+        try:
+            for scan_code in scan_codes_for(name):
+                modifier_scan_codes[scan_code] = modifier_scan_codes.get(scan_code, 0) | bit
+        except (ValueError, KeyError):
+            pass
+
+    bindings = []
+    errors = []
+    for action, hotkey_str in hotkeys.items():
+        if not hotkey_str:
+            continue
+        if not hotkey_str.strip():
+            continue
+        strokes = split_strokes(hotkey_str)
+        try:
+            keys = [_compile_stroke(stroke, scan_codes_for) for stroke in strokes]
+        except (ValueError, KeyError) as e:
+            errors.append(f"{action}: {e}")
+            continue
+        bindings.append((action, hotkey_str, keys))
+
+    # Shortest first, so a prefix is always in the trie before what it would shadow.
+    bindings.sort(key=lambda binding: len(binding[2]))
+    index = {}
+    for action, hotkey_str, keys in bindings:
+        strokes = [[(scan_code, mask) for scan_code in scan_codes] for scan_codes, mask in keys]
+        for path in itertools.product(*strokes):
+            blocker = _insert(index, path, action)
+            if blocker is not None:
+                errors.append(f"{action}: '{hotkey_str}' can never fire because it starts with "
+                              f"'{hotkeys[blocker]}' ({blocker})")
+                break
+
+    return HotkeyTable(index, modifier_scan_codes, errors, chord_timeout)
+
+class HotkeyDispatcher:
+    """
+    Resolves raw key events to actions in O(1) per event.
+
+    Multi-stroke hotkeys walk the table's trie one stroke per KEY_DOWN. While
+    a chord is pending, a key that continues it takes precedence over any
+    single-stroke binding for the same key. Modifier presses don't break a
+    chord; any other key that doesn't continue it abandons the chord and is
+    resolved from the start again, as is the next key after chord_timeout
+    seconds without one.
+
+    Held keys are tracked by scan code, so auto-repeated KEY_DOWNs are rejected
+    before any lookup and a hotkey fires once per physical press. A binding
+    still fires while extra modifiers are held (ctrl+x with shift down too),
+    matching the old keyboard.is_pressed() behaviour; see expand_modifiers().
+
+    The table is replaced by a single reference swap and read once per event,
+    so it can be changed from another thread while the hook keeps running.
+    While paused, key state is still tracked but no actions are returned.
+    """
+    def __init__(self, table=None):
+        self.table = table if table is not None else HotkeyTable({}, {}, [])
+        self.paused = False
+        self._down = set()
+        self._mask = 0
+        self._chord = None
+        self._chord_deadline = 0.0
+
+    def set_table(self, table):
+        self.table = table
+        self._chord = None
+
+    def feed(self, scan_code, is_down):
+        """Feeds one key event and returns the triggered action name, or None."""
+        down = self._down
+        table = self.table
+        if is_down:
+            if scan_code in down:
+                return None
+            down.add(scan_code)
+            mask = self._mask
+            modifier_bit = table.modifier_scan_codes.get(scan_code)
+            if modifier_bit is not None:
+                self._mask = mask | modifier_bit
+            if self.paused:
+                self._chord = None
+                return None
+            chord = self._chord
+            if chord is not None:
+                now = time.monotonic()
+                if now <= self._chord_deadline:
+                    action = chord.get((scan_code, mask))
+                    if action is not None:
+                        return self._advance(action, table, now)
+                    if modifier_bit is not None:
+                        return None
+                self._chord = None
+            action = table.lookup.get((scan_code, mask))
+            if action.__class__ is ChordNode:
+                return self._advance(action, table, time.monotonic())
+            return action
+
+        down.discard(scan_code)
+        if scan_code in table.modifier_scan_codes:
+            modifier_scan_codes = table.modifier_scan_codes
+            mask = 0
+            for held in down:
+                mask |= modifier_scan_codes.get(held, 0)
+            self._mask = mask
+        return None
+
+    def _advance(self, action, table, now):
+        """Moves along a chord: returns a completed action, or keeps waiting on a prefix."""
+        if action.__class__ is ChordNode:
+            self._chord = action
+            self._chord_deadline = now + table.chord_timeout
+            return None
+        self._chord = None
+        return action
@@ -0,0 +1,216 @@
+import hashlib
+import os
+import re
+import struct
+import tempfile
+import threading
+
+MAGIC = b"MVNJRN1\0"
+HEADER = struct.Struct("<IB")
+RECORD = struct.Struct("<BB")
+OP_PUSH = 1
+OP_POP = 2
+OP_CLEAR = 3
+FLUSH_INTERVAL = 0.25
+COMPACT_AFTER = 4096
+
+def journal_file_name(profile_name):
+    """A file-system safe, collision-free file name for a profile's journal."""
+    readable = re.sub(r'[^A-Za-z0-9_-]+', '_', profile_name)[:40]
+    digest = hashlib.sha1(profile_name.encode('utf-8')).hexdigest()[:8]
+    return f"{readable}-{digest}.mvnjrn"
+
+def encode_header(action_names, evicted):
+    names = [name.encode('utf-8')[:255] for name in action_names][:255]
+    header = bytearray(MAGIC)
+    header += HEADER.pack(min(evicted, 0xFFFFFFFF), len(names))
+    for name in names:
+        header.append(len(name))
+        header += name
+    return header
+
+def read_journal(path):
+    """
+    Replays a journal file and returns (action_names, codes, evicted), or
+    None if it is missing or unreadable. A torn final record is ignored.
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    if not data.startswith(MAGIC):
+        return None
+    try:
+        offset = len(MAGIC)
+        evicted, count = HEADER.unpack_from(data, offset)
+        offset += HEADER.size
+        action_names = []
+        for _ in range(count):
+            length = data[offset]
+            action_names.append(data[offset + 1:offset + 1 + length].decode('utf-8'))
+            offset += 1 + length
+    except (struct.error, IndexError, UnicodeDecodeError):
+        return None
+
+    codes = []
+    usable = offset + (len(data) - offset) // RECORD.size * RECORD.size
+    for op, code in RECORD.iter_unpack(data[offset:usable]):
+        if op == OP_PUSH:
+            codes.append(code)
+        elif op == OP_POP:
+            if codes:
+                codes.pop()
+        elif op == OP_CLEAR:
+            codes = []
+            evicted = 0
+    return action_names, codes, evicted
+
+class SequenceJournal:
+    """
+    Append-only, per-profile journal of sequence mutations, so the sequence
+    survives a crash or restart.
+
+    Each file is MAGIC, a header (uint32 entries evicted before the first
+    record, uint8 name count, then a uint8 length and UTF-8 name for each
+    action the codes refer to) and then fixed 2-byte records: uint8 op and
+    uint8 action code. record() and reset() only touch in-memory buffers;
+    a background thread swaps them out and writes them to disk every
+    FLUSH_INTERVAL seconds, so key handling never waits on the disk.
+
+    reset() compacts a journal: the file is atomically replaced by a header
+    and one push per entry currently in the sequence. It happens on every
+    clear, when the action names change, and after COMPACT_AFTER records.
+    """
+    def __init__(self, directory, interval=FLUSH_INTERVAL):
+        self.directory = directory
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._appends = {}
+        self._rewrites = {}
+        self._in_flight = set()
+        self._counts = {}
+        self._closed = False
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="SequenceJournal", daemon=True)
+        self._thread.start()
+
+    def path_for(self, profile_name):
+        return os.path.join(self.directory, journal_file_name(profile_name))
+
+    def restore(self, profile_name):
+        """
+        Returns (action_names, codes, evicted) for a profile's journal, or
+        None if there is none. This reads the file, and only waits for the
+        writer if that profile still has buffered writes, which a profile
+        not yet restored in this session normally doesn't.
+        """
+        path = self.path_for(profile_name)
+        with self._lock:
+            pending = path in self._appends or path in self._rewrites or path in self._in_flight
+        if pending:
+            self.flush()
+        return read_journal(path)
+
+    def record(self, profile_name, op, code=0):
+        """Buffers one mutation. Returns True once the journal is due for compaction."""
+        path = self.path_for(profile_name)
+        with self._lock:
+            buffer = self._appends.get(path)
+            if buffer is None:
+                buffer = self._appends[path] = bytearray()
+            buffer += RECORD.pack(op, code)
+            count = self._counts.get(path, 0) + 1
+            self._counts[path] = count
+        return count >= COMPACT_AFTER
+
+    def reset(self, profile_name, action_names, codes, evicted=0):
+        """Replaces a profile's journal with a compact snapshot of its current sequence."""
+        data = encode_header(action_names, evicted)
+        for code in codes:
+            data += RECORD.pack(OP_PUSH, code)
+        path = self.path_for(profile_name)
+        with self._lock:
+            self._rewrites[path] = bytes(data)
+            self._appends.pop(path, None)
+            self._counts[path] = 0
+
+    def discard(self, profile_name):
+        """Deletes a profile's journal."""
+        path = self.path_for(profile_name)
+        with self._lock:
+            self._rewrites[path] = None
+            self._appends.pop(path, None)
+            self._counts.pop(path, None)
+
+    def flush(self):
+        """Writes everything buffered so far before returning."""
+        self._write_pending()
+
+    def close(self):
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+        self.flush()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.interval)
+            self._write_pending()
+
+    def _write_pending(self):
+        """
+        Swaps the buffers out under the lock and writes them outside it, so
+        record() and reset() never wait on the disk. The write lock keeps
+        batches in order when flush() runs alongside the writer thread.
+        """
+        with self._write_lock:
+            with self._lock:
+                rewrites, self._rewrites = self._rewrites, {}
+                appends, self._appends = self._appends, {}
+                self._in_flight = set(rewrites) | set(appends)
+            if not rewrites and not appends:
+                return
+            try:
+                self._write(rewrites, appends)
+            finally:
+                with self._lock:
+                    self._in_flight = set()
+
+    def _write(self, rewrites, appends):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+        except OSError:
+            return
+        for path, data in rewrites.items():
+            try:
+                if data is None:
+                    os.remove(path)
+                else:
+                    self._replace(path, data)
+            except OSError:
+                pass
+        for path, data in appends.items():
+            if not data:
+                continue
+            try:
+                with open(path, 'ab') as f:
+                    f.write(data)
+            except OSError:
+                pass
+
+    def _replace(self, path, data):
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=".journal-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
@@ -0,0 +1,142 @@
+import json
+import time
+from collections import deque
+
+BUCKET_COUNT = 24
+STAGES = ('dispatch', 'queue', 'flush', 'paint', 'total')
+
+class Histogram:
+    """Fixed-size latency histogram with power-of-two microsecond buckets (bucket 0 is < 1us)."""
+    __slots__ = ('counts', 'count', 'total_ns', 'max_ns')
+
+    def __init__(self):
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, elapsed_ns):
+        bucket = (elapsed_ns // 1000).bit_length()
+        self.counts[bucket if bucket < BUCKET_COUNT else BUCKET_COUNT - 1] += 1
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+
+    def percentile_us(self, fraction):
+        """Upper bound, in microseconds, of the bucket holding the given fraction of samples."""
+        if not self.count:
+            return 0
+        threshold = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= threshold:
+                return 1 << bucket
+        return 1 << (BUCKET_COUNT - 1)
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_us": round(self.total_ns / self.count / 1000, 1) if self.count else 0,
+            "p50_us": self.percentile_us(0.5),
+            "p99_us": self.percentile_us(0.99),
+            "max_us": round(self.max_ns / 1000, 1),
+            "buckets": list(self.counts),
+        }
+
+class LatencyTracker:
+    """
+    Times each matched keypress from the keyboard hook callback to the overlay
+    repaint, using perf_counter_ns stamps handed from stage to stage:
+
+        dispatch  hook callback entry -> action resolved, about to queue (hook thread)
+        queue     queued -> Overlay.handle_key_event running on the GUI thread
+        flush     handled -> coalesced display flush finished
+        paint     flushed -> overlay backing store repainted
+        total     hook callback entry -> repainted (or flushed, if the overlay is hidden)
+
+    Only the hook thread appends to the dispatch histogram and the handoff
+    deque; every other stage is recorded on the GUI thread.
+    """
+    def __init__(self):
+        self.histograms = {stage: Histogram() for stage in STAGES}
+        self._queued = deque(maxlen=4096)
+        self._handling = None
+        self._awaiting_flush = []
+        self._awaiting_paint = []
+
+    def hook_event(self, hook_ns):
+        """Called on the hook thread just before the action is queued for the GUI thread."""
+        emitted_ns = time.perf_counter_ns()
+        self.histograms['dispatch'].record(emitted_ns - hook_ns)
+        self._queued.append((hook_ns, emitted_ns))
+
+    def action_dropped(self, newest=True):
+        """
+        Called on the hook thread when the queue dropped an action: the one
+        just stamped by hook_event, or with newest=False the oldest queued one.
+        """
+        if self._queued:
+            if newest:
+                self._queued.pop()
+            else:
+                self._queued.popleft()
+
+    def action_handled(self):
+        """Called on the GUI thread as an action is taken off the queue, before it is applied."""
+        if not self._queued:
+            self._handling = None
+            return
+        hook_ns, emitted_ns = self._queued.popleft()
+        handled_ns = time.perf_counter_ns()
+        self.histograms['queue'].record(handled_ns - emitted_ns)
+        self._handling = (hook_ns, handled_ns)
+
+    def action_applied(self, changed):
+        """
+        Called once the action was applied. Only an action that scheduled a
+        display change waits for the next flush; others would be charged to
+        some later, unrelated flush.
+        """
+        if changed and self._handling is not None:
+            self._awaiting_flush.append(self._handling)
+        self._handling = None
+
+    def flushed(self, visible):
+        if not self._awaiting_flush:
+            return
+        flushed_ns = time.perf_counter_ns()
+        flush = self.histograms['flush']
+        for hook_ns, handled_ns in self._awaiting_flush:
+            flush.record(flushed_ns - handled_ns)
+            if visible:
+                self._awaiting_paint.append((hook_ns, flushed_ns))
+            else:
+                self.histograms['total'].record(flushed_ns - hook_ns)
+        self._awaiting_flush = []
+
+    def painted(self):
+        if not self._awaiting_paint:
+            return
+        painted_ns = time.perf_counter_ns()
+        paint = self.histograms['paint']
+        total = self.histograms['total']
+        for hook_ns, flushed_ns in self._awaiting_paint:
+            paint.record(painted_ns - flushed_ns)
+            total.record(painted_ns - hook_ns)
+        self._awaiting_paint = []
+
+    def summary(self):
+        return {stage: histogram.summary() for stage, histogram in self.histograms.items()}
+
+    def summary_line(self):
+        total = self.histograms['total']
+        if not total.count:
+            return "Latency: no keypresses yet"
+        return (f"Latency (n={total.count}): p50 <{total.percentile_us(0.5)}us, "
+                f"p99 <{total.percentile_us(0.99)}us, max {total.max_ns / 1e6:.1f}ms")
+
+    def dump(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.summary(), f, indent=4)
@@ -1,5 +1,28 @@
+import sys
+import time
+
+STARTED = time.perf_counter()
+profiler = None
+if "--startup-profile" in sys.argv:
+    from startup_profile import StartupProfiler
+    profiler = StartupProfiler(STARTED)
+    profiler.install()
+
+import argparse
+
 from app import Application
 
 if __name__ == "__main__":
-    main_app = Application()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", action="store_true", help="track keypress-to-paint latency and show it in the tray")
+    parser.add_argument("--startup-profile", action="store_true", help="report import and init times once started")
+    parser.add_argument("--replay", metavar="RECORDING", help="replay a session recording through the hotkey handler")
+    parser.add_argument("--replay-speed", type=float, default=1.0, help="replay speed multiplier; 0 replays as fast as possible")
+    parser.add_argument("--diagnostics", action="store_true", help="sample memory, CPU and Qt object counts to a rotating log")
+    args, _ = parser.parse_known_args()
+
+    if profiler is not None:
+        profiler.mark("modules imported")
+    main_app = Application(latency=args.latency, profiler=profiler, replay=args.replay, replay_speed=args.replay_speed,
+                           diagnostics=args.diagnostics)
     main_app.run()
@@ -1,45 +1,170 @@
+import time
+from collections import deque
+
 import win32gui
 import win32con
-from PyQt5.QtWidgets import QWidget, QLabel, QApplication
-from PyQt5.QtCore import Qt, QPoint, pyqtSignal
-from PyQt5.QtGui import QFont
+from PyQt5.QtWidgets import QWidget, QApplication
+from PyQt5.QtCore import Qt, QPoint, QTimer, QEvent, pyqtSignal
+
+from renderers import create_styled_strip
+from screens import ScreenTracker
+
+MAX_CACHED_STRIPS = 8
+
+class RenderStats:
+    """Keeps recent display update timings so per-push cost can be compared against sequence length."""
+    def __init__(self, maxlen=1024):
+        self.samples = deque(maxlen=maxlen)
+
+    def record(self, length, elapsed_ns):
+        self.samples.append((length, elapsed_ns))
+
+    def summary(self, buckets=4):
+        """
+        Groups samples by sequence length into equal-sized buckets and returns
+        [(min_length, max_length, mean_microseconds), ...]. Flat means mean cost
+        stays level as length grows.
+        """
+        samples = sorted(self.samples)
+        if not samples:
+            return []
+        size = max(1, -(-len(samples) // buckets))
+        result = []
+        for i in range(0, len(samples), size):
+            chunk = samples[i:i + size]
+            mean_us = sum(ns for _, ns in chunk) / len(chunk) / 1000
+            result.append((chunk[0][0], chunk[-1][0], round(mean_us, 2)))
+        return result
+
+class FlushStats:
+    """Counts display update requests against the flushes that actually re-laid out the overlay."""
+    def __init__(self):
+        self.requested = 0
+        self.flushed = 0
+
+    @property
+    def merged(self):
+        return self.requested - self.flushed
 
 class Overlay(QWidget):
-    """A transparent, always-on-top window to display text."""
-    key_action_triggered = pyqtSignal(str)
+    """
+    A transparent, always-on-top window showing a SequenceEngine's sequence.
+    The engine owns all sequence state; the overlay only styles, sizes and
+    places the strip and redraws it from the engine's render model.
+    """
+    next_profile_requested = pyqtSignal()
 
-    def __init__(self, config):
+    def __init__(self, engine, screens=None):
         super().__init__()
-        self.sequence = []
-        self.overlay_enabled = True
+        self.engine = engine
+        self.profile = None
         self._is_win32_style_set = False
+        self._last_width = None
+        self._anchor = None
+        self._style_key = None
+        self._strips = {}
+        self._preview_strip = None
+        self.strip = None
+        self.render_stats = RenderStats()
+        self.flush_stats = FlushStats()
+        self.latency = None
+        self._last_flush = 0.0
+
+        screen = QApplication.primaryScreen()
+        refresh_rate = screen.refreshRate() if screen else 60
+        self._frame_ms = 1000 / (refresh_rate if refresh_rate > 0 else 60)
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self.flush_display)
+
+        self.screens = screens if screens is not None else ScreenTracker(self)
+        self.screens.changed.connect(self.on_screens_changed)
         
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool | Qt.WA_TranslucentBackground)
         self.setAttribute(Qt.WA_TransparentForMouseEvents)
         self.setAttribute(Qt.WA_ShowWithoutActivating)
 
-        self.label = QLabel(self)
-        self.label.setTextFormat(Qt.RichText)
-        
-        self.update_config(config)
+        self.apply_profile(engine.profile)
         
-        self.key_action_triggered.connect(self.handle_key_event)
-        self.update_display()
+        engine.on_change = self.schedule_flush
 
-    def update_config(self, config):
-        """Updates all configuration settings for the overlay."""
-        self.config = config
-        style_config = self.config.get("style", {})
-        bg_color = style_config.get('background_color', 'black')
-        font_size = style_config.get('font_size', 24)
-        self.pos_x = style_config.get('x', 'center')
-        self.pos_y = style_config.get('y', 20)
-        self.separator = style_config.get('separator', ' -> ')
-        
-        self.label.setFont(QFont("Arial", font_size, QFont.Bold))
-        self.label.setStyleSheet(f"background-color: {bg_color}; padding: 10px; border-radius: 5px;")
+    def apply_profile(self, profile):
+        """Shows the strip styled for a compiled RuntimeProfile at its position, and redraws."""
+        self.profile = profile
+        if profile.style_key != self._style_key:
+            if self.engine.previewing:
+                strip = self._preview_strip_for(profile.style_key)
+            else:
+                strip = self._strip_for(profile.style_key)
+            if self.strip is not None and self.strip is not strip:
+                self.strip.hide()
+            self.strip = strip
+            self.strip.show()
+            self._style_key = profile.style_key
+        if not self.engine.previewing and self._preview_strip is not None:
+            self._preview_strip.deleteLater()
+            self._preview_strip = None
+        self._anchor = None
+        self._last_width = None
         self.update_display()
 
+    def update_profile(self, profile, changes):
+        """Like apply_profile, but only restyles or moves when profile_changes() says so."""
+        if self.engine.previewing:
+            return
+        if "style" in changes:
+            self.apply_profile(profile)
+            return
+        self.profile = profile
+        if "position" in changes:
+            self._anchor = None
+            self._last_width = None
+            if self.isVisible():
+                self.reposition_overlay()
+
+    def _strip_for(self, key):
+        """
+        Returns a strip already styled for key, building it on first use.
+        Styled strips are kept so switching back to a profile's look is a swap.
+        """
+        strip = self._strips.pop(key, None)
+        if strip is None:
+            strip = create_styled_strip(key, self)
+            strip.hide()
+        self._strips[key] = strip
+        while len(self._strips) > MAX_CACHED_STRIPS:
+            oldest_key = next(iter(self._strips))
+            if oldest_key == self._style_key:
+                self._strips[oldest_key] = self._strips.pop(oldest_key)
+                continue
+            self._strips.pop(oldest_key).deleteLater()
+        return strip
+
+    def _preview_strip_for(self, key):
+        """
+        Returns a strip for a preview's style. Previews change with every
+        edit, so they get one throwaway strip of their own rather than
+        pushing the profiles' strips out of the cache.
+        """
+        strip = self._strips.get(key)
+        if strip is not None:
+            return strip
+        if self._preview_strip is not None:
+            self._preview_strip.hide()
+            self._preview_strip.deleteLater()
+        self._preview_strip = create_styled_strip(key, self)
+        self._preview_strip.hide()
+        return self._preview_strip
+
+    def prepare_style(self, profile):
+        """Builds and caches the strip for a profile's style without showing it."""
+        if profile.style_key not in self._strips:
+            self._strip_for(profile.style_key)
+
+    def sync_profile(self):
+        """Follows the engine after it switched profile or started or ended a preview."""
+        self.apply_profile(self.engine.profile)
+
     def showEvent(self, event):
         super().showEvent(event)
         if not self._is_win32_style_set:
@@ -49,46 +174,106 @@ class Overlay(QWidget):
             self._is_win32_style_set = True
 
     def update_display(self):
-        if self.sequence and self.overlay_enabled:
-            html_parts = []
-            sequence_actions = self.config.get("sequence_actions", {})
-            font_colors = self.config.get("style", {}).get("font_colors", {})
-
-            for action_name in self.sequence:
-                text = sequence_actions.get(action_name, "?")
-                color = font_colors.get(action_name, "#ffffff")
-                html_parts.append(f"<font color='{color}'>{text}</font>")
-            
-            separator_html = f"<font color='white'>{self.separator}</font>"
-            display_text = separator_html.join(html_parts)
-            
-            self.label.setText(display_text)
-            self.label.adjustSize()
-            self.resize(self.label.size())
+        """Rebuilds the whole displayed sequence, superseding any scheduled flush."""
+        self._render(self.engine.render_model(incremental=False))
+
+    def _render(self, model):
+        if not model.visible:
+            self.hide()
+            return
+        if not model.rebuild and not model.codes:
+            return
+        start = time.perf_counter_ns()
+        if model.rebuild:
+            self.strip.set_sequence(model.codes, model.hidden)
+        else:
+            self.strip.extend(model.codes)
+        self._apply_size()
+        self.render_stats.record(self.engine.sequence.total, time.perf_counter_ns() - start)
+
+    def stats(self):
+        """
+        Display update cost by sequence length and how many update requests
+        were merged into a shared flush, for diagnostics samples and the
+        benchmarks.
+        """
+        return {
+            "render_us_by_length": [list(bucket) for bucket in self.render_stats.summary()],
+            "update_requests": self.flush_stats.requested,
+            "flushes": self.flush_stats.flushed,
+            "merged_updates": self.flush_stats.merged,
+        }
+
+    def schedule_flush(self):
+        """
+        Defers re-layout to the next flush. Flushes are spaced at least one
+        display frame apart, so a burst of actions costs a single repaint.
+        """
+        self.flush_stats.requested += 1
+        if not self._flush_timer.isActive():
+            elapsed_ms = (time.monotonic() - self._last_flush) * 1000
+            self._flush_timer.start(max(0, int(self._frame_ms - elapsed_ms)))
+
+    def flush_display(self):
+        self._flush_timer.stop()
+        self._last_flush = time.monotonic()
+        self.flush_stats.flushed += 1
+        self._render(self.engine.render_model(incremental=self.isVisible()))
+        if self.latency is not None:
+            self.latency.flushed(self.isVisible())
+
+    def event(self, event):
+        handled = super().event(event)
+        if self.latency is not None and event.type() == QEvent.UpdateRequest:
+            self.latency.painted()
+        return handled
+
+    def _apply_size(self):
+        size = self.strip.size()
+        if size != self.size():
+            self.resize(size)
+        if not self.isVisible():
             self.show()
+        if size.width() != self._last_width:
+            self._last_width = size.width()
             self.reposition_overlay()
-        else:
-            self.hide()
+
+    def placement_anchor(self):
+        """
+        Returns the global point the overlay is centred on horizontally and
+        hangs from vertically. X and Y are relative to the target screen; a
+        position stored for that screen overrides the general one.
+        """
+        if self._anchor is None:
+            profile = self.profile
+            name, screen_geometry = self.screens.resolve(profile.screen)
+            position = profile.screen_positions.get(name) or {'x': profile.x, 'y': profile.y}
+            x = position.get('x', 'center')
+            center_x = screen_geometry.width() // 2 if x == 'center' else x
+            self._anchor = QPoint(screen_geometry.x() + center_x, screen_geometry.y() + position.get('y', 20))
+        return self._anchor
 
     def reposition_overlay(self):
         """Positions the overlay, treating the stored X as a center point."""
-        screen_geometry = QApplication.desktop().screenGeometry()
-        if self.pos_x == 'center':
-            center_x = screen_geometry.width() // 2
-        else:
-            center_x = self.pos_x
-            
-        top_left_x = center_x - (self.width() // 2)
-        top_left_y = self.pos_y
-        self.move(QPoint(top_left_x, top_left_y))
+        anchor = self.placement_anchor()
+        self.move(QPoint(anchor.x() - (self.width() // 2), anchor.y()))
+
+    def on_screens_changed(self):
+        self._anchor = None
+        self._last_width = None
+        if self.isVisible():
+            self.reposition_overlay()
 
     def handle_key_event(self, action):
-        sequence_actions = self.config.get("sequence_actions", {})
-        if action == 'Toggle Overlay':
-            self.overlay_enabled = not self.overlay_enabled
-        elif self.overlay_enabled:
-            if action in sequence_actions:
-                self.sequence.append(action)
-            elif action == 'Clear Sequence':
-                self.sequence.clear()
-        self.update_display()
+        """Applies the action to the engine right away; the engine's change callback schedules the repaint."""
+        latency = self.latency
+        if latency is None:
+            if not self.engine.apply(action) and action == 'Next Profile':
+                self.next_profile_requested.emit()
+            return
+        latency.action_handled()
+        requested = self.flush_stats.requested
+        handled = self.engine.apply(action)
+        latency.action_applied(self.flush_stats.requested != requested)
+        if not handled and action == 'Next Profile':
+            self.next_profile_requested.emit()
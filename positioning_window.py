@@ -0,0 +1,47 @@
+from PyQt5.QtWidgets import QLabel, QVBoxLayout, QPushButton, QDialog
+from PyQt5.QtGui import QFont
+from PyQt5.QtCore import Qt, pyqtSignal
+
+class PositioningWindow(QDialog):
+    """A draggable, frameless dialog to set the position."""
+    position_set = pyqtSignal(int, int)
+
+    def __init__(self, style_config, icon, parent=None):
+        super().__init__(parent)
+        self.setWindowIcon(icon)
+            
+        self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        
+        self.drag_position = None
+        layout = QVBoxLayout(self)
+        
+        self.preview_label = QLabel("Drag me to position, then click OK")
+        font_color = style_config.get('font_color', '#ffffff')
+        bg_color = style_config.get('background_color', 'black')
+        self.preview_label.setStyleSheet(f"color: {font_color}; background-color: {bg_color}; padding: 10px; border-radius: 5px;")
+        self.preview_label.setFont(QFont("Arial", style_config.get('font_size', 24), QFont.Bold))
+        
+        ok_button = QPushButton("OK")
+        ok_button.clicked.connect(self.accept_position)
+        
+        layout.addWidget(self.preview_label)
+        layout.addWidget(ok_button)
+        self.adjustSize()
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self.drag_position = event.globalPos() - self.frameGeometry().topLeft()
+            event.accept()
+
+    def mouseMoveEvent(self, event):
+        if event.buttons() == Qt.LeftButton and self.drag_position:
+            self.move(event.globalPos() - self.drag_position)
+            event.accept()
+
+    def accept_position(self):
+        final_geom = self.frameGeometry()
+        center_x = final_geom.center().x()
+        top_y = final_geom.top()
+        self.position_set.emit(center_x, top_y)
+        self.close()
@@ -0,0 +1,204 @@
+import struct
+import threading
+import time
+
+MAGIC = b"MVNREC1\0"
+RECORD = struct.Struct("<IHBB")
+RECORDS_PER_CHUNK = 4096
+NO_ACTION = 0xFF
+MAX_DELTA_US = 0xFFFFFFFF
+
+class RecordingWriter:
+    """
+    Streams hook events to a compact binary log.
+
+    The file starts with MAGIC and the action names the log refers to
+    (uint8 count, then a uint8 length and UTF-8 name for each). Every event
+    after that is a fixed 8-byte record: uint32 microseconds since the
+    previous event, uint16 scan code, uint8 event type (1 = down, 0 = up) and
+    uint8 resolved action index (NO_ACTION if none). Records are packed into
+    a preallocated chunk; full chunks are handed to a background thread that
+    writes them out, so the hook never waits on the disk. If a write fails,
+    `error` says why and the rest of the session isn't written.
+    """
+    def __init__(self, path, action_names):
+        self.path = path
+        self.action_names = list(action_names)[:NO_ACTION]
+        self._codes = {name: code for code, name in enumerate(self.action_names)}
+        self._chunk = bytearray(RECORD.size * RECORDS_PER_CHUNK)
+        self._spare = []
+        self._full = []
+        self._used = 0
+        self._last_ns = time.perf_counter_ns()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._wake = threading.Event()
+        self.count = 0
+        self.error = None
+
+        self._file = open(path, 'wb')
+        header = bytearray(MAGIC)
+        header.append(len(self.action_names))
+        for name in self.action_names:
+            encoded = name.encode('utf-8')[:255]
+            header.append(len(encoded))
+            header += encoded
+        self._file.write(header)
+        self._thread = threading.Thread(target=self._run, name="RecordingWriter", daemon=True)
+        self._thread.start()
+
+    def record(self, scan_code, is_down, action):
+        now = time.perf_counter_ns()
+        with self._lock:
+            if self._closed:
+                return
+            delta_us = min((now - self._last_ns) // 1000, MAX_DELTA_US)
+            self._last_ns = now
+            RECORD.pack_into(self._chunk, self._used, delta_us, scan_code & 0xFFFF, 1 if is_down else 0,
+                             self._codes.get(action, NO_ACTION))
+            self._used += RECORD.size
+            self.count += 1
+            if self._used == len(self._chunk):
+                self._full.append(self._chunk)
+                self._chunk = self._spare.pop() if self._spare else bytearray(len(self._chunk))
+                self._used = 0
+                self._wake.set()
+
+    def close(self):
+        """Writes the remaining events and closes the file."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._full.append(memoryview(self._chunk)[:self._used])
+        self._wake.set()
+        self._thread.join()
+        self._file.close()
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            with self._lock:
+                chunks, self._full = self._full, []
+                closed = self._closed
+            for chunk in chunks:
+                if self.error is None:
+                    try:
+                        self._file.write(chunk)
+                    except OSError as e:
+                        self.error = str(e)
+            with self._lock:
+                self._spare.extend(chunk for chunk in chunks if isinstance(chunk, bytearray))
+            if closed:
+                return
+
+def read_recording(path):
+    """
+    Opens a recording and returns (action_names, records), where records is a
+    generator of (delta_us, scan_code, is_down, action_name or None) tuples
+    read one chunk at a time.
+    """
+    f = open(path, 'rb')
+    try:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a session recording")
+        action_names = []
+        for _ in range(f.read(1)[0]):
+            length = f.read(1)[0]
+            action_names.append(f.read(length).decode('utf-8'))
+    except (IndexError, UnicodeDecodeError):
+        f.close()
+        raise ValueError(f"{path} has a truncated header")
+    except BaseException:
+        f.close()
+        raise
+
+    def records():
+        with f:
+            while True:
+                chunk = f.read(RECORD.size * RECORDS_PER_CHUNK)
+                if not chunk:
+                    return
+                usable = len(chunk) - len(chunk) % RECORD.size
+                for delta_us, scan_code, is_down, code in RECORD.iter_unpack(chunk[:usable]):
+                    yield delta_us, scan_code, bool(is_down), action_names[code] if code < len(action_names) else None
+
+    return action_names, records()
+
+class ReplayEvent:
+    """Looks enough like keyboard.KeyboardEvent for Application.keyboard_event_handler."""
+    __slots__ = ('event_type', 'scan_code', 'name', 'time')
+
+    def __init__(self, event_type, scan_code):
+        self.event_type = event_type
+        self.scan_code = scan_code
+        self.name = None
+        self.time = None
+
+class Replayer:
+    """
+    Feeds a recording back through a key event handler on a background thread,
+    the way the keyboard hook would. speed=1.0 replays in real time, higher
+    values replay faster, and speed=0 replays as fast as possible. The handler
+    must return the resolved action so it can be checked against the log.
+    If the recording can't be read, `error` describes why; on_finished is
+    called either way.
+    """
+    def __init__(self, path, handler, speed=1.0, on_finished=None):
+        self.path = path
+        self.handler = handler
+        self.speed = speed
+        self.on_finished = on_finished
+        self.events = 0
+        self.actions = 0
+        self.mismatches = 0
+        self.elapsed = 0.0
+        self.error = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="Replayer", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        start = time.perf_counter()
+        try:
+            self._replay(start)
+        except (OSError, ValueError) as e:
+            self.error = str(e)
+        self.elapsed = time.perf_counter() - start
+        if self.on_finished is not None:
+            self.on_finished(self)
+
+    def _replay(self, start):
+        import keyboard
+        _, records = read_recording(self.path)
+        handler = self.handler
+        speed = self.speed
+        down_type, up_type = keyboard.KEY_DOWN, keyboard.KEY_UP
+        due = start
+        for delta_us, scan_code, is_down, recorded_action in records:
+            if self._stop.is_set():
+                break
+            if speed > 0:
+                due += delta_us / 1e6 / speed
+                wait = due - time.perf_counter()
+                if wait > 0 and self._stop.wait(wait):
+                    break
+            action = handler(ReplayEvent(down_type if is_down else up_type, scan_code))
+            self.events += 1
+            if action is not None:
+                self.actions += 1
+            if action != recorded_action:
+                self.mismatches += 1
+
+    def summary(self):
+        if self.error is not None:
+            return f"Could not replay {self.path}: {self.error}"
+        return (f"Replayed {self.events} events in {self.elapsed:.2f}s: "
+                f"{self.actions} actions, {self.mismatches} differing from the recording")
@@ -0,0 +1,248 @@
+from bisect import bisect_right
+
+from PyQt5.QtWidgets import QWidget, QLabel, QFrame, QHBoxLayout
+from PyQt5.QtCore import Qt, QRect, QRectF, QSize
+from PyQt5.QtGui import QFont, QPalette, QColor, QPixmap, QPainter, QFontMetrics, QImage
+
+PADDING_X = 20
+PADDING_Y = 10
+CORNER_RADIUS = 5
+
+UNKNOWN_TOKEN = ("?", "#ffffff")
+SEPARATOR_COLOR = "white"
+INDICATOR_FORMAT = "+{} more"
+
+class SequenceStrip(QFrame):
+    """
+    Shows the sequence as a row of cached QLabels, one per token and separator.
+    Pushing actions only fills in the next labels, so nothing already on
+    screen is re-parsed or re-measured.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName("sequenceStrip")
+        self._layout = QHBoxLayout(self)
+        self._layout.setContentsMargins(PADDING_X, PADDING_Y, PADDING_X, PADDING_Y)
+        self._layout.setSpacing(0)
+        self._layout.setSizeConstraint(QHBoxLayout.SetFixedSize)
+        self._labels = []
+        self._count = 0
+        self._font = QFont()
+        self._tokens = []
+        self._unknown = (UNKNOWN_TOKEN[0], self._palette(UNKNOWN_TOKEN[1]))
+        self._separator = (" -> ", self._palette(SEPARATOR_COLOR))
+
+    def _palette(self, color):
+        palette = QPalette(self.palette())
+        palette.setColor(QPalette.WindowText, QColor(color))
+        return palette
+
+    def set_style(self, font, background_color, tokens, separator):
+        """Caches the text and palette for every action; tokens[code] is that action's (text, color)."""
+        self._font = font
+        self.setStyleSheet(f"QFrame#sequenceStrip {{ background-color: {background_color}; border-radius: {CORNER_RADIUS}px; }}")
+        self._tokens = [(text, self._palette(color)) for text, color in tokens]
+        self._separator = (separator, self._palette(SEPARATOR_COLOR))
+        for label in self._labels:
+            label.setFont(font)
+
+    def set_sequence(self, codes, hidden=0):
+        """Shows the given action codes, preceded by a "+k more" indicator if `hidden` is non-zero."""
+        self._count = 0
+        if hidden:
+            self._put((INDICATOR_FORMAT.format(hidden), self._separator[1]))
+        self._put_codes(codes)
+        for label in self._labels[self._count:]:
+            label.hide()
+        self.adjustSize()
+
+    def extend(self, codes):
+        self._put_codes(codes)
+        self.adjustSize()
+
+    def _put_codes(self, codes):
+        tokens = self._tokens
+        for code in codes:
+            if self._count:
+                self._put(self._separator)
+            self._put(tokens[code] if code < len(tokens) else self._unknown)
+
+    def _put(self, token):
+        text, palette = token
+        if self._count < len(self._labels):
+            label = self._labels[self._count]
+        else:
+            label = QLabel(self)
+            label.setTextFormat(Qt.PlainText)
+            label.setFont(self._font)
+            self._layout.addWidget(label)
+            self._labels.append(label)
+        if label.text() != text:
+            label.setText(text)
+        label.setPalette(palette)
+        label.show()
+        self._count += 1
+
+class TokenAtlas:
+    """
+    Every sequence token and the separator rasterized once into a single
+    transparent pixmap. Tokens are looked up by action code; the separator and
+    unknown token use the SEPARATOR and UNKNOWN keys.
+    """
+    SEPARATOR = object()
+    UNKNOWN = object()
+
+    def __init__(self, font, tokens, separator, device_pixel_ratio=1.0):
+        entries = [(self.SEPARATOR, separator, SEPARATOR_COLOR), (self.UNKNOWN, *UNKNOWN_TOKEN)]
+        entries += [(code, text, color) for code, (text, color) in enumerate(tokens)]
+
+        self.font = font
+        self.metrics = metrics = QFontMetrics(font)
+        self.height = metrics.height()
+        self.widths = {}
+        self.sources = {}
+        x = 0
+        for key, text, _ in entries:
+            width = metrics.boundingRect(0, 0, 0, 0, Qt.AlignLeft, text).width()
+            self.widths[key] = width
+            self.sources[key] = QRectF(x * device_pixel_ratio, 0, width * device_pixel_ratio, self.height * device_pixel_ratio)
+            x += width
+
+        image = QImage(max(1, int(x * device_pixel_ratio)), max(1, int(self.height * device_pixel_ratio)), QImage.Format_ARGB32_Premultiplied)
+        image.setDevicePixelRatio(device_pixel_ratio)
+        image.fill(Qt.transparent)
+        painter = QPainter(image)
+        painter.setFont(font)
+        x = 0
+        for key, text, color in entries:
+            painter.setPen(QColor(color))
+            painter.drawText(x, metrics.ascent(), text)
+            x += self.widths[key]
+        painter.end()
+        self.pixmap = QPixmap.fromImage(image)
+
+    def key_for(self, code):
+        return code if code in self.widths else self.UNKNOWN
+
+    def text_width(self, text):
+        return self.metrics.boundingRect(0, 0, 0, 0, Qt.AlignLeft, text).width()
+
+class PaintedStrip(QWidget):
+    """
+    Paint-based alternative to SequenceStrip. Tokens are blitted from a
+    TokenAtlas in paintEvent; pushing actions only extends the offset list and
+    repaints the newly covered rectangle.
+    """
+    INDICATOR = object()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        self._atlas = None
+        self._background = QColor('black')
+        self._codes = []
+        self._hidden = 0
+        self._indicator = ""
+        self._keys = []
+        self._offsets = []
+        self._content_width = 0
+
+    def set_style(self, font, background_color, tokens, separator):
+        self._background = QColor(background_color)
+        self._atlas = TokenAtlas(font, tokens, separator, self.devicePixelRatioF())
+        self.set_sequence(self._codes, self._hidden)
+
+    def set_sequence(self, codes, hidden=0):
+        self._codes = []
+        self._hidden = hidden
+        self._keys = []
+        self._offsets = []
+        self._content_width = 0
+        if hidden:
+            self._indicator = INDICATOR_FORMAT.format(hidden)
+            self._keys.append(self.INDICATOR)
+            self._offsets.append(0)
+            self._content_width = self._atlas.text_width(self._indicator)
+        self.extend(codes)
+        self.update()
+
+    def extend(self, codes):
+        start = self._content_width
+        atlas = self._atlas
+        for code in codes:
+            self._codes.append(code)
+            if self._keys:
+                self._keys.append(TokenAtlas.SEPARATOR)
+                self._offsets.append(self._content_width)
+                self._content_width += atlas.widths[TokenAtlas.SEPARATOR]
+            key = atlas.key_for(code)
+            self._keys.append(key)
+            self._offsets.append(self._content_width)
+            self._content_width += atlas.widths[key]
+        self._resize_to_content()
+        self.update(QRect(PADDING_X + start, 0, self._content_width - start + PADDING_X, self.height()))
+
+    def _resize_to_content(self):
+        height = (self._atlas.height if self._atlas else 0) + 2 * PADDING_Y
+        size = QSize(self._content_width + 2 * PADDING_X, height)
+        if size != self.size():
+            self.resize(size)
+
+    def paintEvent(self, event):
+        if self._atlas is None:
+            return
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(self._background)
+        painter.drawRoundedRect(QRectF(self.rect()), CORNER_RADIUS, CORNER_RADIUS)
+
+        atlas = self._atlas
+        exposed = event.rect()
+        first = max(0, bisect_right(self._offsets, exposed.left() - PADDING_X) - 1)
+        last = bisect_right(self._offsets, exposed.right() - PADDING_X)
+        for i in range(first, last):
+            key = self._keys[i]
+            if key is self.INDICATOR:
+                painter.setFont(atlas.font)
+                painter.setPen(QColor(SEPARATOR_COLOR))
+                painter.drawText(PADDING_X + self._offsets[i], PADDING_Y + atlas.metrics.ascent(), self._indicator)
+                continue
+            target = QRectF(PADDING_X + self._offsets[i], PADDING_Y, atlas.widths[key], atlas.height)
+            painter.drawPixmap(target, atlas.pixmap, atlas.sources[key])
+        painter.end()
+
+RENDERERS = {
+    "labels": SequenceStrip,
+    "painted": PaintedStrip,
+}
+
+def create_strip(renderer, parent=None):
+    """Creates the sequence view named by style["renderer"], falling back to labels."""
+    return RENDERERS.get(renderer, SequenceStrip)(parent)
+
+def create_styled_strip(key, parent=None):
+    """Creates a strip and styles it from a RuntimeProfile.style_key."""
+    renderer, font_size, bg_color, separator, tokens = key
+    strip = create_strip(renderer, parent)
+    strip.set_style(QFont("Arial", font_size, QFont.Bold), bg_color, list(tokens), separator)
+    return strip
+
+def count_differing_pixels(widget_a, widget_b, tolerance=8):
+    """
+    Grabs both widgets and counts pixels where any channel differs by more than
+    tolerance, or returns None if their sizes differ. Used to check that the
+    renderers produce the same output.
+    """
+    image_a = widget_a.grab().toImage().convertToFormat(QImage.Format_ARGB32)
+    image_b = widget_b.grab().toImage().convertToFormat(QImage.Format_ARGB32)
+    if image_a.size() != image_b.size():
+        return None
+    differing = 0
+    for y in range(image_a.height()):
+        for x in range(image_a.width()):
+            a = image_a.pixel(x, y)
+            b = image_b.pixel(x, y)
+            if any(abs(((a >> shift) & 0xff) - ((b >> shift) & 0xff)) > tolerance for shift in (0, 8, 16, 24)):
+                differing += 1
+    return differing
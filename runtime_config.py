@@ -0,0 +1,170 @@
+from types import MappingProxyType
+
+from PyQt5.QtGui import QColor
+
+from config import DEFAULT_CONFIG
+from hotkeys import compile_hotkeys
+from renderers import RENDERERS
+
+DEFAULT_STYLE = DEFAULT_CONFIG["style"]
+DEFAULT_FONT_COLOR = "#ffffff"
+MAX_SEQUENCE_ACTIONS = 255
+
+class RuntimeProfile:
+    """
+    Read-only, validated form of one profile's config. Everything the key
+    and display paths need is resolved once here: the hotkey table, the
+    action code for each sequence action with its (text, color) token, and
+    the style key the overlay's strip cache is indexed by.
+    """
+    __slots__ = ('config', 'hotkeys', 'chord_timeout_ms', 'action_names', 'action_codes', 'tokens', 'style_key',
+                 'renderer', 'font_size', 'background_color', 'separator', 'max_visible',
+                 'x', 'y', 'screen', 'screen_positions', 'focus_processes', 'focus_titles', 'errors')
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            object.__setattr__(self, name, fields[name])
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+def _is_color(value):
+    return isinstance(value, str) and QColor.isValidColor(value)
+
+def _is_count(value):
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+def _is_coordinate(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+STYLE_CHECKS = {
+    'renderer': (lambda value: value in RENDERERS, f"must be one of {', '.join(RENDERERS)}"),
+    'font_size': (_is_count, "must be a positive whole number"),
+    'background_color': (_is_color, "is not a color"),
+    'separator': (lambda value: isinstance(value, str), "must be text"),
+    'max_visible': (lambda value: value is None or _is_count(value), "must be a positive whole number or null"),
+    'x': (lambda value: value == 'center' or _is_coordinate(value), 'must be a whole number or "center"'),
+    'y': (_is_coordinate, "must be a whole number"),
+    'screen': (lambda value: value is None or isinstance(value, str), "must be a screen name or null"),
+}
+
+def _section(config, name, errors):
+    value = config.get(name, DEFAULT_CONFIG[name])
+    if isinstance(value, dict):
+        return value
+    errors.append(f"{name} must be an object; using the defaults")
+    return DEFAULT_CONFIG[name]
+
+def _screen_positions(value, errors):
+    if not isinstance(value, dict):
+        errors.append("style.screen_positions must be an object; ignoring it")
+        return MappingProxyType({})
+    positions = {}
+    for name, position in value.items():
+        if (isinstance(position, dict) and _is_coordinate(position.get('y', 0))
+                and (position.get('x', 'center') == 'center' or _is_coordinate(position.get('x')))):
+            positions[name] = MappingProxyType(dict(position))
+        else:
+            errors.append(f"style.screen_positions.{name} must have whole-number x and y; ignoring it")
+    return MappingProxyType(positions)
+
+def _text_list(focus, key, errors):
+    value = focus.get(key, [])
+    if isinstance(value, list) and all(isinstance(item, str) for item in value):
+        return tuple(item for item in value if item.strip())
+    errors.append(f"focus.{key} must be a list of text; ignoring it")
+    return ()
+
+def compile_profile(config, scan_codes_for=None):
+    """
+    Validates a profile config and compiles it into a RuntimeProfile. Invalid
+    values are replaced by their defaults, and each one is described in the
+    result's `errors` so it can be reported.
+    """
+    errors = []
+    hotkey_config = _section(config, "hotkeys", errors)
+    sequence_actions = _section(config, "sequence_actions", errors)
+    style = _section(config, "style", errors)
+    focus = _section(config, "focus", errors)
+
+    bindings = {}
+    for action, hotkey in hotkey_config.items():
+        if isinstance(hotkey, str):
+            bindings[action] = hotkey
+        else:
+            errors.append(f"hotkey for {action} must be text")
+    chord_timeout_ms = config.get("chord_timeout_ms", DEFAULT_CONFIG["chord_timeout_ms"])
+    if not _is_count(chord_timeout_ms):
+        errors.append(f"chord_timeout_ms must be a positive whole number; using {DEFAULT_CONFIG['chord_timeout_ms']}")
+        chord_timeout_ms = DEFAULT_CONFIG["chord_timeout_ms"]
+    hotkeys = compile_hotkeys(bindings, scan_codes_for, chord_timeout_ms / 1000)
+    errors.extend(hotkeys.errors)
+
+    font_colors = style.get("font_colors", {})
+    if not isinstance(font_colors, dict):
+        errors.append("style.font_colors must be an object; using white")
+        font_colors = {}
+    action_names = []
+    tokens = []
+    for action, text in sequence_actions.items():
+        if len(action_names) == MAX_SEQUENCE_ACTIONS:
+            errors.append(f"only the first {MAX_SEQUENCE_ACTIONS} sequence actions are used")
+            break
+        if not isinstance(text, str):
+            errors.append(f"text for {action} must be text")
+            text = str(text)
+        color = font_colors.get(action, DEFAULT_FONT_COLOR)
+        if not _is_color(color):
+            errors.append(f"font color {color!r} for {action} is not a color; using white")
+            color = DEFAULT_FONT_COLOR
+        action_names.append(action)
+        tokens.append((text, color))
+    tokens = tuple(tokens)
+
+    values = {}
+    for key, (is_valid, problem) in STYLE_CHECKS.items():
+        value = style.get(key, DEFAULT_STYLE[key])
+        if not is_valid(value):
+            errors.append(f"style.{key} {problem}; using {DEFAULT_STYLE[key]!r}")
+            value = DEFAULT_STYLE[key]
+        values[key] = value
+
+    return RuntimeProfile(
+        config=config,
+        hotkeys=hotkeys,
+        chord_timeout_ms=chord_timeout_ms,
+        action_names=tuple(action_names),
+        action_codes=MappingProxyType({action: code for code, action in enumerate(action_names)}),
+        tokens=tokens,
+        style_key=(values['renderer'], values['font_size'], values['background_color'], values['separator'], tokens),
+        screen_positions=_screen_positions(style.get('screen_positions') or {}, errors),
+        focus_processes=_text_list(focus, "processes", errors),
+        focus_titles=_text_list(focus, "titles", errors),
+        errors=tuple(errors),
+        **values,
+    )
+
+def profile_changes(old, new):
+    """
+    Names the parts of a profile that differ between two RuntimeProfiles:
+    "hotkeys" (bindings and chord timeout), "actions" (sequence action names), "style" (anything the strip
+    is styled from), "position", "layout" (max_visible) and "focus" (the
+    foreground targets).
+    """
+    changes = set()
+    if old.config.get("hotkeys") != new.config.get("hotkeys") or old.chord_timeout_ms != new.chord_timeout_ms:
+        changes.add("hotkeys")
+    if old.action_names != new.action_names:
+        changes.add("actions")
+    if old.style_key != new.style_key:
+        changes.add("style")
+    if (old.x, old.y, old.screen, old.screen_positions) != (new.x, new.y, new.screen, new.screen_positions):
+        changes.add("position")
+    if old.max_visible != new.max_visible:
+        changes.add("layout")
+    if (old.focus_processes, old.focus_titles) != (new.focus_processes, new.focus_titles):
+        changes.add("focus")
+    return changes
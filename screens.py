@@ -0,0 +1,54 @@
+from PyQt5.QtCore import QObject, QRect, pyqtSignal
+from PyQt5.QtGui import QGuiApplication
+
+class ScreenTracker(QObject):
+    """
+    Caches the geometry of every connected screen. The cache is only dropped
+    when Qt reports a screen being added, removed or changing geometry, so
+    positioning the overlay never has to query the platform.
+    """
+    changed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._geometries = None
+        self._primary = None
+
+        app = QGuiApplication.instance()
+        app.screenAdded.connect(self._on_screen_added)
+        app.screenRemoved.connect(self.invalidate)
+        app.primaryScreenChanged.connect(self.invalidate)
+        for screen in QGuiApplication.screens():
+            screen.geometryChanged.connect(self.invalidate)
+
+    def _on_screen_added(self, screen):
+        screen.geometryChanged.connect(self.invalidate)
+        self.invalidate()
+
+    def invalidate(self, *args):
+        self._geometries = None
+        self.changed.emit()
+
+    def _snapshot(self):
+        if self._geometries is None:
+            primary = QGuiApplication.primaryScreen()
+            self._primary = primary.name() if primary else None
+            self._geometries = {screen.name(): screen.geometry() for screen in QGuiApplication.screens()}
+        return self._geometries
+
+    def names(self):
+        return list(self._snapshot())
+
+    def resolve(self, name=None):
+        """Returns (name, geometry) of the named screen, falling back to the primary screen."""
+        geometries = self._snapshot()
+        if name not in geometries:
+            name = self._primary
+        return name, geometries.get(name, QRect())
+
+    def screen_at(self, point):
+        """Returns the name of the screen containing a global point, or the primary screen."""
+        for name, geometry in self._snapshot().items():
+            if geometry.contains(point):
+                return name
+        return self._primary
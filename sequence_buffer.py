@@ -0,0 +1,63 @@
+from array import array
+
+DEFAULT_CAPACITY = 1024
+
+class SequenceBuffer:
+    """
+    Fixed-capacity ring buffer of small integer action codes. Pushing onto a
+    full buffer overwrites the oldest entry and counts it in `evicted`, so
+    memory stays bounded however long the sequence runs. push, pop and clear
+    are O(1); tail(n) is O(n).
+    """
+    __slots__ = ('capacity', 'evicted', '_codes', '_start', '_length')
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.evicted = 0
+        self._codes = array('B', bytes(capacity))
+        self._start = 0
+        self._length = 0
+
+    def __len__(self):
+        return self._length
+
+    def __bool__(self):
+        return self._length > 0
+
+    def __iter__(self):
+        return iter(self.tail(self._length))
+
+    @property
+    def total(self):
+        """Entries pushed since the last clear, including evicted ones."""
+        return self._length + self.evicted
+
+    def push(self, code):
+        if self._length < self.capacity:
+            self._codes[(self._start + self._length) % self.capacity] = code
+            self._length += 1
+        else:
+            self._codes[self._start] = code
+            self._start = (self._start + 1) % self.capacity
+            self.evicted += 1
+
+    def pop(self):
+        """Removes and returns the newest code, or None if the buffer is empty."""
+        if not self._length:
+            return None
+        self._length -= 1
+        return self._codes[(self._start + self._length) % self.capacity]
+
+    def clear(self):
+        self._start = 0
+        self._length = 0
+        self.evicted = 0
+
+    def tail(self, count):
+        """Returns the newest `count` codes, oldest first."""
+        count = min(count, self._length)
+        first = (self._start + self._length - count) % self.capacity
+        end = first + count
+        if end <= self.capacity:
+            return self._codes[first:end].tolist()
+        return self._codes[first:].tolist() + self._codes[:end - self.capacity].tolist()
@@ -0,0 +1,87 @@
+import sys
+import time
+
+class _TimingLoader:
+    """
+    Wraps a module loader so loading is timed, nesting like python -X importtime.
+    Extension modules do their work in create_module, so that is counted too.
+    """
+    def __init__(self, loader, profiler):
+        self._loader = loader
+        self._profiler = profiler
+        self._create_time = 0.0
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        start = time.perf_counter()
+        try:
+            return self._loader.create_module(spec)
+        finally:
+            self._create_time = time.perf_counter() - start
+
+    def exec_module(self, module):
+        profiler = self._profiler
+        profiler._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            inclusive = time.perf_counter() - start + self._create_time
+            children = profiler._stack.pop()
+            if profiler._stack:
+                profiler._stack[-1] += inclusive
+            profiler.imports.append((module.__name__, inclusive - children, inclusive, len(profiler._stack)))
+
+class _TimingFinder:
+    """Meta path finder that defers to the real finders and wraps the loader they return."""
+    def __init__(self, profiler):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                    spec.loader = _TimingLoader(spec.loader, self._profiler)
+                return spec
+        return None
+
+class StartupProfiler:
+    """
+    Records per-module import times and named init milestones from process
+    start until the event loop is running, for the --startup-profile flag.
+    """
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.imports = []
+        self.marks = []
+        self._stack = []
+        self._finder = _TimingFinder(self)
+
+    def install(self):
+        sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self):
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+
+    def mark(self, name):
+        self.marks.append((name, time.perf_counter()))
+
+    def report(self, top=25):
+        lines = ["Startup profile", "", "Milestones (ms since start, +delta):"]
+        previous = self.start
+        for name, moment in self.marks:
+            lines.append(f"  {(moment - self.start) * 1000:9.1f}  +{(moment - previous) * 1000:8.1f}  {name}")
+            previous = moment
+
+        total_imports = sum(inclusive for _, _, inclusive, depth in self.imports if depth == 0)
+        lines += ["", f"Imports: {len(self.imports)} modules, {total_imports * 1000:.1f} ms at top level",
+                  f"Slowest {top} by self time (ms self / inclusive):"]
+        for name, self_time, inclusive, _ in sorted(self.imports, key=lambda item: item[1], reverse=True)[:top]:
+            lines.append(f"  {self_time * 1000:9.2f} / {inclusive * 1000:9.2f}  {name}")
+        return "\n".join(lines)
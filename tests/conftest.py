@@ -0,0 +1,15 @@
+"""
+Runs the tests headlessly, the way benchmarks/run.py does: Qt's offscreen
+platform, a throwaway APPDATA and the stand-in keyboard and win32 modules
+from benchmarks/stubs ahead of the real ones.
+"""
+import os
+import sys
+import tempfile
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(TESTS_DIR)
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ["APPDATA"] = tempfile.mkdtemp(prefix="maven-tests-")
+sys.path[:0] = [os.path.join(REPO_DIR, "benchmarks", "stubs"), REPO_DIR]
@@ -0,0 +1,46 @@
+from focus_gate import FocusGate, StaticFocusProvider
+
+def make_gate(process="", title=""):
+    changes = []
+    provider = StaticFocusProvider(process, title)
+    gate = FocusGate(provider, on_change=changes.append)
+    gate.start()
+    return gate, provider, changes
+
+def test_open_without_targets():
+    gate, provider, changes = make_gate("notepad.exe")
+    provider.set_foreground("explorer.exe")
+    assert gate.allowed
+    assert changes == []
+
+def test_process_target_ignores_case():
+    gate, provider, changes = make_gate("notepad.exe")
+    gate.set_targets(["PathOfExile.exe"], [])
+    assert not gate.allowed
+    provider.set_foreground("pathofexile.exe", "Path of Exile")
+    assert gate.allowed
+    provider.set_foreground("notepad.exe")
+    assert not gate.allowed
+    assert changes == [False, True, False]
+
+def test_title_target_matches_substring():
+    gate, provider, changes = make_gate()
+    gate.set_targets([], ["Path of Exile"])
+    provider.set_foreground("client.exe", "PATH OF EXILE 2")
+    assert gate.allowed
+    provider.set_foreground("client.exe", "Path of Exile - Launcher")
+    assert changes == [False, True]
+
+def test_clearing_targets_opens_gate():
+    gate, provider, changes = make_gate("notepad.exe")
+    gate.set_targets(["pathofexile.exe"], [])
+    gate.set_targets([], [])
+    assert gate.allowed
+    assert changes == [False, True]
+
+def test_stopped_provider_reports_nothing():
+    gate, provider, changes = make_gate()
+    gate.set_targets(["pathofexile.exe"], [])
+    gate.stop()
+    provider.set_foreground("pathofexile.exe")
+    assert not gate.allowed
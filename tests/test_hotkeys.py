@@ -0,0 +1,129 @@
+import keyboard
+import pytest
+
+import hotkeys
+from hotkeys import HotkeyDispatcher, compile_hotkeys, split_hotkey, split_strokes
+
+def scan_code(name):
+    return keyboard.key_to_scan_codes(name)[0]
+
+class Keys:
+    """Presses keys by name on a dispatcher, on a clock the test moves."""
+    def __init__(self, bindings, chord_timeout=1.0):
+        self.table = compile_hotkeys(bindings, chord_timeout=chord_timeout)
+        self.dispatcher = HotkeyDispatcher(self.table)
+
+    def down(self, name):
+        return self.dispatcher.feed(scan_code(name), True)
+
+    def up(self, name):
+        return self.dispatcher.feed(scan_code(name), False)
+
+    def tap(self, name):
+        action = self.down(name)
+        self.up(name)
+        return action
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(hotkeys.time, "monotonic", lambda: now[0])
+    return now
+
+@pytest.mark.parametrize("hotkey, keys", [
+    ("ctrl+shift+x", ["ctrl", "shift", "x"]),
+    ("+", ["+"]),
+    ("ctrl++", ["ctrl", "+"]),
+    (" F1 ", ["f1"]),
+])
+def test_split_hotkey(hotkey, keys):
+    assert split_hotkey(hotkey) == keys
+
+@pytest.mark.parametrize("hotkey, strokes", [
+    ("g, 1", ["g", "1"]),
+    ("ctrl+,", ["ctrl+,"]),
+    ("g, ,", ["g", ","]),
+    (",", [","]),
+    ("ctrl+g, shift+1, x", ["ctrl+g", "shift+1", "x"]),
+])
+def test_split_strokes(hotkey, strokes):
+    assert split_strokes(hotkey) == strokes
+
+def test_single_stroke_fires_once_per_press():
+    keys = Keys({"A": "f1"})
+    assert keys.down("f1") == "A"
+    assert keys.down("f1") is None
+    keys.up("f1")
+    assert keys.tap("f1") == "A"
+
+def test_extra_modifiers_fall_back_to_subset():
+    keys = Keys({"Plain": "x", "Ctrl": "ctrl+x", "Ctrl Shift": "ctrl+shift+x"})
+    assert keys.tap("x") == "Plain"
+    keys.down("ctrl")
+    assert keys.tap("x") == "Ctrl"
+    keys.down("shift")
+    assert keys.tap("x") == "Ctrl Shift"
+    keys.down("alt")
+    assert keys.tap("x") == "Ctrl Shift"
+    keys.up("ctrl")
+    keys.up("alt")
+    assert keys.tap("x") == "Plain"
+
+def test_chord(clock):
+    keys = Keys({"Chord": "g, 1", "One": "1"})
+    assert keys.tap("g") is None
+    assert keys.tap("1") == "Chord"
+    assert keys.tap("1") == "One"
+
+def test_chord_survives_modifier_presses(clock):
+    keys = Keys({"Chord": "g, ctrl+1"})
+    keys.tap("g")
+    keys.down("ctrl")
+    assert keys.tap("1") == "Chord"
+
+def test_other_key_abandons_chord(clock):
+    keys = Keys({"Chord": "g, 1", "Two": "2", "One": "1"})
+    keys.tap("g")
+    assert keys.tap("2") == "Two"
+    assert keys.tap("1") == "One"
+
+def test_chord_times_out(clock):
+    keys = Keys({"Chord": "g, 1", "One": "1"}, chord_timeout=0.5)
+    keys.tap("g")
+    clock[0] += 0.6
+    assert keys.tap("1") == "One"
+
+def test_comma_key_in_chord(clock):
+    keys = Keys({"Comma": "g, ,", "Ctrl Comma": "ctrl+,"})
+    keys.tap("g")
+    assert keys.tap(",") == "Comma"
+    keys.down("ctrl")
+    assert keys.tap(",") == "Ctrl Comma"
+
+def test_prefix_conflict_is_reported():
+    table = compile_hotkeys({"Short": "g", "Long": "g, 1"})
+    assert len(table.errors) == 1
+    assert table.errors[0].startswith("Long: 'g, 1' can never fire because it starts with 'g'")
+    keys = Keys({"Short": "g", "Long": "g, 1"})
+    assert keys.tap("g") == "Short"
+
+@pytest.mark.parametrize("hotkey", ["ctrl+", "g, ", "x+g", "nosuchkey"])
+def test_invalid_hotkeys_are_reported(hotkey):
+    table = compile_hotkeys({"Bad": hotkey})
+    assert len(table.errors) == 1
+    assert table.errors[0].startswith("Bad: ")
+    assert len(table) == 0
+
+def test_paused_dispatcher_tracks_keys():
+    keys = Keys({"Ctrl": "ctrl+x"})
+    keys.dispatcher.paused = True
+    keys.down("ctrl")
+    assert keys.tap("x") is None
+    keys.dispatcher.paused = False
+    assert keys.tap("x") == "Ctrl"
+
+def test_set_table_drops_pending_chord(clock):
+    keys = Keys({"Chord": "g, 1", "One": "1"})
+    keys.tap("g")
+    keys.dispatcher.set_table(keys.table)
+    assert keys.tap("1") == "One"
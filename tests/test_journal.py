@@ -0,0 +1,100 @@
+import types
+
+import journal
+from engine import SequenceEngine
+from hotkeys import compile_hotkeys
+from journal import OP_CLEAR, OP_POP, OP_PUSH, RECORD, SequenceJournal, encode_header, read_journal
+
+def write(path, action_names, ops, evicted=0):
+    data = encode_header(action_names, evicted)
+    for op, code in ops:
+        data += RECORD.pack(op, code)
+    path.write_bytes(bytes(data))
+
+def make_profile(action_names):
+    return types.SimpleNamespace(hotkeys=compile_hotkeys({}), action_names=tuple(action_names),
+                                 action_codes={name: code for code, name in enumerate(action_names)},
+                                 max_visible=None)
+
+def test_replay(tmp_path):
+    path = tmp_path / "p.mvnjrn"
+    write(path, ["Left", "Top"], [(OP_PUSH, 0), (OP_PUSH, 1), (OP_PUSH, 1), (OP_POP, 0), (OP_PUSH, 0)], evicted=3)
+    assert read_journal(path) == (["Left", "Top"], [0, 1, 0], 3)
+
+def test_clear_resets_codes_and_evicted(tmp_path):
+    path = tmp_path / "p.mvnjrn"
+    write(path, ["Left"], [(OP_PUSH, 0), (OP_CLEAR, 0), (OP_PUSH, 0), (OP_POP, 0), (OP_POP, 0)], evicted=5)
+    assert read_journal(path) == (["Left"], [], 0)
+
+def test_torn_final_record_is_ignored(tmp_path):
+    path = tmp_path / "p.mvnjrn"
+    write(path, ["Left"], [(OP_PUSH, 0), (OP_PUSH, 0)])
+    path.write_bytes(path.read_bytes() + bytes([OP_PUSH]))
+    assert read_journal(path) == (["Left"], [0, 0], 0)
+
+def test_missing_or_foreign_file(tmp_path):
+    assert read_journal(tmp_path / "missing.mvnjrn") is None
+    path = tmp_path / "other.mvnjrn"
+    path.write_bytes(b"not a journal")
+    assert read_journal(path) is None
+    path.write_bytes(journal.MAGIC + b"\x01")
+    assert read_journal(path) is None
+
+def test_records_and_resets_round_trip(tmp_path):
+    sequence_journal = SequenceJournal(str(tmp_path), interval=60)
+    try:
+        sequence_journal.reset("Main", ["Left", "Top"], [1], evicted=2)
+        sequence_journal.record("Main", OP_PUSH, 0)
+        sequence_journal.record("Main", OP_POP)
+        sequence_journal.record("Main", OP_PUSH, 1)
+        assert sequence_journal.restore("Main") == (["Left", "Top"], [1, 1], 2)
+    finally:
+        sequence_journal.close()
+
+def test_compaction_is_due_after_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr(journal, "COMPACT_AFTER", 3)
+    sequence_journal = SequenceJournal(str(tmp_path), interval=60)
+    try:
+        assert not sequence_journal.record("Main", OP_PUSH, 0)
+        assert not sequence_journal.record("Main", OP_PUSH, 0)
+        assert sequence_journal.record("Main", OP_PUSH, 0)
+        sequence_journal.reset("Main", ["Left"], [0, 0, 0])
+        assert not sequence_journal.record("Main", OP_POP)
+        sequence_journal.flush()
+        path = sequence_journal.path_for("Main")
+        assert len(open(path, 'rb').read()) == len(encode_header(["Left"], 0)) + 4 * RECORD.size
+        assert read_journal(path) == (["Left"], [0, 0], 0)
+    finally:
+        sequence_journal.close()
+
+def test_discard_removes_journal(tmp_path):
+    sequence_journal = SequenceJournal(str(tmp_path), interval=60)
+    try:
+        sequence_journal.reset("Main", ["Left"], [0])
+        sequence_journal.flush()
+        sequence_journal.discard("Main")
+        assert sequence_journal.restore("Main") is None
+    finally:
+        sequence_journal.close()
+
+def test_engine_restores_sequences(tmp_path, monkeypatch):
+    monkeypatch.setattr(journal, "COMPACT_AFTER", 2)
+    profile = make_profile(["Left", "Top"])
+    sequence_journal = SequenceJournal(str(tmp_path), interval=60)
+    engine = SequenceEngine(profile, "Main", journal=sequence_journal)
+    for action in ("Left", "Top", "Top", "Undo Last", "Left"):
+        engine.apply(action)
+    engine.switch_profile("Other", profile)
+    engine.apply("Top")
+    sequence_journal.close()
+
+    sequence_journal = SequenceJournal(str(tmp_path), interval=60)
+    try:
+        engine = SequenceEngine(make_profile(["Top", "Left"]), "Main", journal=sequence_journal)
+        assert list(engine.sequence) == [1, 0, 1]
+        engine.restore_profiles(["Main", "Other"])
+        monkeypatch.setattr(sequence_journal, "restore", None)
+        engine.switch_profile("Other", profile)
+        assert list(engine.sequence) == [1]
+    finally:
+        sequence_journal.close()
@@ -0,0 +1,71 @@
+import copy
+
+import pytest
+
+from config import DEFAULT_CONFIG
+from runtime_config import compile_profile, profile_changes
+
+def make_config(**changes):
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    for path, value in changes.items():
+        section, _, key = path.rpartition('__')
+        (config[section] if section else config)[key] = value
+    return config
+
+def test_default_config_is_valid():
+    profile = compile_profile(make_config())
+    assert profile.errors == ()
+    assert profile.action_names == tuple(DEFAULT_CONFIG["sequence_actions"])
+    assert profile.action_codes["Sequence 2"] == 1
+    assert profile.hotkeys.chord_timeout == 1.0
+
+@pytest.mark.parametrize("key, value, problem", [
+    ("style__renderer", "fancy", "style.renderer must be one of"),
+    ("style__font_size", 0, "style.font_size must be a positive whole number"),
+    ("style__font_size", True, "style.font_size must be a positive whole number"),
+    ("style__background_color", "not a color", "style.background_color is not a color"),
+    ("style__x", "left", 'style.x must be a whole number or "center"'),
+    ("style__max_visible", -1, "style.max_visible must be a positive whole number or null"),
+    ("chord_timeout_ms", 0, "chord_timeout_ms must be a positive whole number"),
+    ("focus__processes", "game.exe", "focus.processes must be a list of text"),
+])
+def test_invalid_value_is_reported_and_defaulted(key, value, problem):
+    profile = compile_profile(make_config(**{key: value}))
+    assert len(profile.errors) == 1
+    assert profile.errors[0].startswith(problem)
+    section, _, name = key.rpartition('__')
+    if section == "style":
+        assert getattr(profile, name) == DEFAULT_CONFIG["style"][name]
+
+def test_invalid_sections_fall_back_to_defaults():
+    config = make_config()
+    config["hotkeys"] = ["f1"]
+    profile = compile_profile(config)
+    assert profile.errors == ("hotkeys must be an object; using the defaults",)
+    assert len(profile.hotkeys) == len(DEFAULT_CONFIG["hotkeys"])
+
+def test_hotkey_problems_are_reported():
+    config = make_config()
+    config["hotkeys"] = {"Sequence 1": "g", "Sequence 2": "g, 1", "Sequence 3": 3}
+    profile = compile_profile(config)
+    assert "hotkey for Sequence 3 must be text" in profile.errors
+    assert any(error.startswith("Sequence 2: 'g, 1' can never fire") for error in profile.errors)
+
+def test_bad_font_color_uses_white():
+    config = make_config()
+    config["style"]["font_colors"] = {"Sequence 1": "nope"}
+    profile = compile_profile(config)
+    assert profile.tokens[0][1] == "#ffffff"
+    assert len(profile.errors) == 1
+
+def test_profile_is_read_only():
+    profile = compile_profile(make_config())
+    with pytest.raises(AttributeError):
+        profile.x = 5
+
+def test_profile_changes():
+    old = compile_profile(make_config())
+    assert profile_changes(old, compile_profile(make_config())) == set()
+    assert profile_changes(old, compile_profile(make_config(chord_timeout_ms=500))) == {"hotkeys"}
+    assert profile_changes(old, compile_profile(make_config(style__y=40))) == {"position"}
+    assert profile_changes(old, compile_profile(make_config(style__font_size=30))) == {"style"}
@@ -0,0 +1,40 @@
+from sequence_buffer import SequenceBuffer
+
+def test_push_pop_tail():
+    buffer = SequenceBuffer(4)
+    assert not buffer
+    assert buffer.pop() is None
+    for code in (1, 2, 3):
+        buffer.push(code)
+    assert len(buffer) == 3
+    assert buffer.tail(2) == [2, 3]
+    assert buffer.pop() == 3
+    assert list(buffer) == [1, 2]
+
+def test_full_buffer_evicts_oldest():
+    buffer = SequenceBuffer(3)
+    for code in range(5):
+        buffer.push(code)
+    assert list(buffer) == [2, 3, 4]
+    assert buffer.evicted == 2
+    assert buffer.total == 5
+    assert buffer.tail(10) == [2, 3, 4]
+
+def test_tail_across_wrap():
+    buffer = SequenceBuffer(4)
+    for code in range(6):
+        buffer.push(code)
+    buffer.pop()
+    buffer.push(9)
+    assert buffer.tail(4) == [2, 3, 4, 9]
+    assert buffer.tail(0) == []
+
+def test_clear_resets_evicted():
+    buffer = SequenceBuffer(2)
+    for code in range(3):
+        buffer.push(code)
+    buffer.clear()
+    assert len(buffer) == 0
+    assert buffer.total == 0
+    buffer.push(7)
+    assert list(buffer) == [7]